@@ -20,13 +20,18 @@ Usage
     agent.chat()
 """
 
-import json
-from typing import List
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Type
 
-from pydantic import Field
+import orjson
+from pydantic import BaseModel, Field
 
 from agents.base_agent import AgentInput, AgentOutput, BaseAgent
 from llm_clients.base_client import BaseLLMClient, LLMResponse, ToolCall
+from tools.base_tool import BaseTool
 from tools.feedback_adapter_tool import FeedbackAdapterTool
 from tools.progress_tracker_tool import ProgressTrackerTool
 from tools.user_profile_tool import UserProfileTool
@@ -54,6 +59,38 @@ Guidelines
 5. After tool calls, explain results in plain, motivating language — don't just
    dump raw JSON at the user."""
 
+_MEMORY_PROMPT = """
+
+What you already know about the user from earlier in this conversation
+(older messages are no longer shown to you, so rely on this):
+{memory}"""
+
+# Number of most recent user turns (each with its assistant replies and tool
+# calls) sent to the model verbatim. Older turns survive only as memory facts.
+DEFAULT_MAX_RECENT_TURNS: int = 10
+
+# Anthropic tool schemas keyed by (tool class, input model). Pydantic's JSON-schema
+# generation walks the whole model, so it runs once per process, not once per agent.
+_SCHEMA_CACHE: Dict[Tuple[type, type], dict] = {}
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def _tool_schema(tool_cls: Type[BaseTool]) -> dict:
+    """Return the (cached) Anthropic tool schema dict for *tool_cls*."""
+    key = (tool_cls, tool_cls.input_type)
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is None:
+        input_schema = tool_cls.input_type.model_json_schema()
+        input_schema.pop("title", None)  # Anthropic doesn't need the Pydantic title
+        schema = {
+            "name": tool_cls.__name__,
+            "description": tool_cls.prompt,
+            "input_schema": input_schema,
+        }
+        with _SCHEMA_CACHE_LOCK:
+            schema = _SCHEMA_CACHE.setdefault(key, schema)
+    return schema
+
 
 class GymTrainerInput(AgentInput):
     data_dir: str = Field(default="data", description="Directory for profile and progress files.")
@@ -67,74 +104,271 @@ class GymTrainerAgent(BaseAgent[GymTrainerInput, GymTrainerOutput]):
     """
     Conversational gym trainer agent with native Anthropic tool calling.
 
-    Call `chat()` to start an interactive session, or `run()` to use the
-    standard BaseAgent interface (which delegates to `chat()`).
+    Call `chat()` to start an interactive session (or `await achat()` from
+    inside an event loop), or `run()` to use the standard BaseAgent interface
+    (which delegates to `chat()`).
+
+    Only the last `max_recent_turns` user turns are kept in the prompt, so
+    its size stays bounded however long the session runs. Stable facts from
+    tool results (the user's profile, progress stats, the latest intensity
+    adjustment) are kept in `_memory` and added to the system prompt instead.
+
+    The tool registry (names, schemas) lives on the class and is shared by
+    every instance; tool objects are only created the first time the model
+    calls them.
     """
 
-    def __init__(self, llm_client: BaseLLMClient, data_dir: str = "data") -> None:
+    TOOL_CLASSES: Tuple[Type[BaseTool], ...] = (
+        UserProfileTool,
+        WorkoutGeneratorTool,
+        ProgressTrackerTool,
+        FeedbackAdapterTool,
+    )
+    _TOOL_CLASS_MAP: Dict[str, Type[BaseTool]] = {cls.__name__: cls for cls in TOOL_CLASSES}
+    # Tools that read or write the user's profile/progress files.
+    _USER_DATA_TOOLS = frozenset(
+        cls.__name__ for cls in (UserProfileTool, ProgressTrackerTool, FeedbackAdapterTool)
+    )
+
+    def __init__(
+        self,
+        llm_client: BaseLLMClient,
+        data_dir: str = "data",
+        max_recent_turns: int = DEFAULT_MAX_RECENT_TURNS,
+    ) -> None:
         super().__init__(llm_client)
         self._data_dir = data_dir
         self._history: List[dict] = []  # Anthropic-format conversation history
+        self._max_recent_turns = max(1, max_recent_turns)
+        self._memory: Dict[str, Any] = {}  # long-term facts distilled from tool results
+        self._rendered_system_prompt: Optional[str] = None  # reset when _memory changes
 
-        self.tools = [
-            UserProfileTool(data_dir),
-            WorkoutGeneratorTool(llm_client),
-            ProgressTrackerTool(llm_client, data_dir),
-            FeedbackAdapterTool(llm_client, data_dir),
-        ]
-        self._tool_map = {t.__class__.__name__: t for t in self.tools}
+        self._tool_instances: Dict[str, BaseTool] = {}  # created on first use
+        self._tool_schemas = self._get_tool_schemas()
+
+    @property
+    def tools(self) -> List[BaseTool]:
+        return [self._get_tool(cls.__name__) for cls in self.TOOL_CLASSES]
 
     # ------------------------------------------------------------------
-    # Tool schema conversion
+    # Tool registry
     # ------------------------------------------------------------------
 
-    def _get_tool_schemas(self) -> List[dict]:
-        """Convert BaseTool instances into Anthropic tool schema dicts."""
-        schemas = []
-        for tool in self.tools:
-            input_schema = tool.input_type.model_json_schema()
-            input_schema.pop("title", None)  # Anthropic doesn't need the Pydantic title
-            schemas.append(
-                {
-                    "name": tool.__class__.__name__,
-                    "description": tool.prompt,
-                    "input_schema": input_schema,
-                }
-            )
-        return schemas
+    @classmethod
+    def _get_tool_schemas(cls) -> List[dict]:
+        """
+        Convert the registered tool classes into Anthropic tool schema dicts.
+
+        The dicts are shared across agent instances — treat them as read-only.
+        """
+        return [_tool_schema(tool_cls) for tool_cls in cls.TOOL_CLASSES]
+
+    def _get_tool(self, tool_name: str) -> Optional[BaseTool]:
+        """Return the tool instance for *tool_name*, creating it on first use."""
+        tool = self._tool_instances.get(tool_name)
+        if tool is None:
+            tool_cls = self._TOOL_CLASS_MAP.get(tool_name)
+            if tool_cls is None:
+                return None
+            tool = self._tool_instances[tool_name] = self._build_tool(tool_cls)
+        return tool
+
+    def _build_tool(self, tool_cls: Type[BaseTool]) -> BaseTool:
+        """Instantiate *tool_cls* with whichever of client / data_dir it needs."""
+        if tool_cls is UserProfileTool:
+            return UserProfileTool(self._data_dir)
+        if tool_cls is WorkoutGeneratorTool:
+            return WorkoutGeneratorTool(self.llm_client)
+        return tool_cls(self.llm_client, self._data_dir)
 
     # ------------------------------------------------------------------
     # Tool execution
     # ------------------------------------------------------------------
 
     def _execute_tool(self, tool_call: ToolCall) -> str:
-        """Look up the tool by name, run it, and return the result as JSON."""
-        tool = self._tool_map.get(tool_call.tool_name)
+        """
+        Look up the tool by name, run it, and return the result as JSON.
+
+        The result is a str, not bytes: a tool_result's content must be a
+        string, and the SDK JSON-encodes the whole request body itself, so
+        bytes would only add a decode step before the request is sent.
+        """
+        tool = self._get_tool(tool_call.tool_name)
         if tool is None:
-            return json.dumps({"error": f"Unknown tool: {tool_call.tool_name}"})
+            return orjson.dumps({"error": f"Unknown tool: {tool_call.tool_name}"}).decode()
         try:
             tool_input = tool.input_type(**tool_call.tool_input)
             result = tool.run(tool_input)
+            self._remember(tool_call.tool_name, result)
+            # Pydantic's own serializer is already native code; no need to
+            # round-trip through model_dump() + orjson here.
             return result.model_dump_json()
         except Exception as exc:
-            return json.dumps({"error": str(exc)})
+            return orjson.dumps({"error": str(exc)}).decode()
+
+    def _execute_tools(self, tool_calls: List[ToolCall]) -> List[str]:
+        """
+        Run all tool calls from one assistant turn and return their results in order.
+
+        Several tools make their own LLM call, so independent calls run
+        concurrently instead of adding up their latencies. Calls to tools in
+        `_USER_DATA_TOOLS` share one lane and run in the order requested, so
+        e.g. a profile save is never overtaken by a load of the same profile.
+
+        A ProgressTrackerTool call followed by a FeedbackAdapterTool call for
+        the same user is answered with one LLM request instead of two (see
+        ProgressTrackerTool.run_with_feedback()).
+        """
+        if len(tool_calls) <= 1:
+            return [self._execute_tool(tc) for tc in tool_calls]
+
+        fused = self._progress_feedback_pair(tool_calls)
+        lanes: Dict[Any, List[int]] = {}
+        for i, tc in enumerate(tool_calls):
+            key = "user_data" if tc.tool_name in self._USER_DATA_TOOLS else i
+            lanes.setdefault(key, []).append(i)
+
+        def run_lane(indices: List[int]) -> List[Tuple[int, str]]:
+            lane_results = []
+            for i in indices:
+                if fused is None or i not in fused:
+                    lane_results.append((i, self._execute_tool(tool_calls[i])))
+                elif i == fused[0]:
+                    progress_json, feedback_json = self._execute_progress_with_feedback(
+                        tool_calls[fused[0]], tool_calls[fused[1]]
+                    )
+                    lane_results += [(fused[0], progress_json), (fused[1], feedback_json)]
+            return lane_results
+
+        results: List[str] = [""] * len(tool_calls)
+        with ThreadPoolExecutor(max_workers=len(lanes)) as executor:
+            for lane_results in executor.map(run_lane, lanes.values()):
+                for i, result_json in lane_results:
+                    results[i] = result_json
+        return results
+
+    @staticmethod
+    def _progress_feedback_pair(tool_calls: List[ToolCall]) -> Optional[Tuple[int, int]]:
+        """
+        Indices of a ProgressTrackerTool call and a later FeedbackAdapterTool
+        call for the same user, if the turn has exactly one of each.
+        """
+        progress = [i for i, tc in enumerate(tool_calls) if tc.tool_name == "ProgressTrackerTool"]
+        feedback = [i for i, tc in enumerate(tool_calls) if tc.tool_name == "FeedbackAdapterTool"]
+        if len(progress) != 1 or len(feedback) != 1 or progress[0] > feedback[0]:
+            return None
+        same_user = (
+            tool_calls[progress[0]].tool_input.get("user_id")
+            == tool_calls[feedback[0]].tool_input.get("user_id")
+        )
+        return (progress[0], feedback[0]) if same_user else None
+
+    def _execute_progress_with_feedback(
+        self, progress_call: ToolCall, feedback_call: ToolCall
+    ) -> Tuple[str, str]:
+        """Run a ProgressTrackerTool and a FeedbackAdapterTool call as one LLM request."""
+        tracker = self._get_tool("ProgressTrackerTool")
+        try:
+            progress_input = tracker.input_type(**progress_call.tool_input)
+            feedback_input = FeedbackAdapterTool.input_type(**feedback_call.tool_input)
+        except Exception:
+            # Let each call report its own validation error.
+            return self._execute_tool(progress_call), self._execute_tool(feedback_call)
+        try:
+            progress, feedback = tracker.run_with_feedback(progress_input, feedback_input)
+        except Exception as exc:
+            error_json = orjson.dumps({"error": str(exc)}).decode()
+            return error_json, error_json
+        self._remember("ProgressTrackerTool", progress)
+        self._remember("FeedbackAdapterTool", feedback)
+        return progress.model_dump_json(), feedback.model_dump_json()
+
+    # ------------------------------------------------------------------
+    # Memory
+    # ------------------------------------------------------------------
+
+    def _remember(self, tool_name: str, result: BaseModel) -> None:
+        """Copy the stable facts from a tool result into long-term memory."""
+        self._rendered_system_prompt = None
+        if tool_name == "UserProfileTool" and result.success and result.profile:
+            profile = dict(result.profile)
+            profile.pop("created_at", None)
+            profile.pop("updated_at", None)
+            self._memory["profile"] = profile
+        elif tool_name == "ProgressTrackerTool":
+            self._memory["progress"] = {
+                "total_sessions": result.total_sessions,
+                "streak_days": result.streak_days,
+            }
+        elif tool_name == "FeedbackAdapterTool":
+            self._memory["last_intensity_adjustment"] = result.intensity_adjustment
+
+    def _system_prompt(self) -> str:
+        """
+        The trainer system prompt plus whatever the agent has memorised.
+
+        Rendered once and reused for every model call until memory changes.
+        """
+        if self._rendered_system_prompt is None:
+            if self._memory:
+                memory = orjson.dumps(self._memory).decode()
+                self._rendered_system_prompt = _SYSTEM_PROMPT + _MEMORY_PROMPT.format(
+                    memory=memory
+                )
+            else:
+                self._rendered_system_prompt = _SYSTEM_PROMPT
+        return self._rendered_system_prompt
+
+    def _trim_history(self) -> None:
+        """
+        Drop everything before the last `max_recent_turns` user turns.
+
+        Only plain-text user messages start a turn. Cutting anywhere else
+        would leave a tool_result without its matching tool_use.
+        """
+        turn_starts = [
+            i
+            for i, message in enumerate(self._history)
+            if message["role"] == "user" and isinstance(message["content"], str)
+        ]
+        if len(turn_starts) > self._max_recent_turns:
+            del self._history[: turn_starts[-self._max_recent_turns]]
 
     # ------------------------------------------------------------------
     # Agentic loop
     # ------------------------------------------------------------------
 
+    def _stream_response(self, tool_schemas: List[dict]) -> LLMResponse:
+        """Print the assistant's reply token by token and return the full response."""
+        self._trim_history()
+
+        response: LLMResponse | None = None
+        printed_text = False
+        events = self.llm_client.complete_with_tools_stream(
+            self._history, tool_schemas, system=self._system_prompt()
+        )
+        for event in events:
+            if event.type == "text_delta":
+                if not printed_text:
+                    sys.stdout.write("\nCoach AI: ")
+                    printed_text = True
+                sys.stdout.write(event.text)
+                sys.stdout.flush()
+            elif event.type == "message_stop":
+                response = event.response
+        if printed_text:
+            sys.stdout.write("\n\n")
+            sys.stdout.flush()
+        return response
+
     def _run_agentic_loop(self, tool_schemas: List[dict]) -> None:
         """
         Inner loop: keep calling the LLM until it stops requesting tools.
-        Prints any assistant text and shows which tools are being used.
+        Streams assistant text to the terminal as it arrives and shows which
+        tools are being used.
         """
         while True:
-            response: LLMResponse = self.llm_client.complete_with_tools(
-                self._history, tool_schemas
-            )
-
-            if response.text:
-                print(f"\nCoach AI: {response.text}\n")
+            response = self._stream_response(tool_schemas)
 
             if response.stop_reason == "end_turn":
                 # Append the assistant's final message and wait for user input.
@@ -146,17 +380,18 @@ class GymTrainerAgent(BaseAgent[GymTrainerInput, GymTrainerOutput]):
                 self._history.append({"role": "assistant", "content": response.raw_content})
 
                 # Execute every requested tool and collect results.
-                tool_results = []
                 for tc in response.tool_calls:
                     print(f"  [Using {tc.tool_name}...]")
-                    result_json = self._execute_tool(tc)
-                    tool_results.append(
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": tc.tool_use_id,
-                            "content": result_json,
-                        }
+                tool_results = [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": tc.tool_use_id,
+                        "content": result_json,
+                    }
+                    for tc, result_json in zip(
+                        response.tool_calls, self._execute_tools(response.tool_calls)
                     )
+                ]
 
                 # Feed results back as a user turn and continue the loop.
                 self._history.append({"role": "user", "content": tool_results})
@@ -165,14 +400,7 @@ class GymTrainerAgent(BaseAgent[GymTrainerInput, GymTrainerOutput]):
     # Public interface
     # ------------------------------------------------------------------
 
-    def chat(self) -> None:
-        """Start an interactive conversation with the gym trainer."""
-        # Apply the trainer system prompt for the duration of the session.
-        original_system = self.llm_client.config.system_prompt
-        self.llm_client.config.system_prompt = _SYSTEM_PROMPT
-
-        tool_schemas = self._get_tool_schemas()
-
+    def _start_session(self) -> None:
         print("\n" + "=" * 60)
         print("  Welcome to Coach AI — Your Personal Gym Trainer")
         print("  Type 'quit' or 'exit' to end the session.")
@@ -180,27 +408,64 @@ class GymTrainerAgent(BaseAgent[GymTrainerInput, GymTrainerOutput]):
 
         # Kick off with a greeting from the agent.
         self._history.append({"role": "user", "content": "Hello, I'm ready to start."})
-        self._run_agentic_loop(tool_schemas)
 
-        try:
-            while True:
-                user_input = input("You: ").strip()
-                if not user_input:
-                    continue
-                if user_input.lower() in ("exit", "quit", "bye"):
-                    print(
-                        "\nCoach AI: Great work today! Keep pushing — "
-                        "every session counts. See you next time!\n"
-                    )
-                    break
+    def _accept_user_input(self, user_input: str) -> Optional[bool]:
+        """
+        Record one line typed by the user.
 
-                self._history.append({"role": "user", "content": user_input})
+        Returns True if the agent should respond, False if the session is
+        over, and None if the line was empty and should be ignored.
+        """
+        user_input = user_input.strip()
+        if not user_input:
+            return None
+        if user_input.lower() in ("exit", "quit", "bye"):
+            print(
+                "\nCoach AI: Great work today! Keep pushing — "
+                "every session counts. See you next time!\n"
+            )
+            return False
+        self._history.append({"role": "user", "content": user_input})
+        return True
+
+    def chat(self) -> None:
+        """Start an interactive conversation with the gym trainer."""
+        # The trainer system prompt is passed with every model call, so the
+        # (possibly shared) client's config is never touched.
+        tool_schemas = self._tool_schemas
+
+        self._start_session()
+        self._run_agentic_loop(tool_schemas)
+        while True:
+            respond = self._accept_user_input(input("You: "))
+            if respond is False:
+                break
+            if respond:
                 self._run_agentic_loop(tool_schemas)
-        finally:
-            self.llm_client.config.system_prompt = original_system
+
+    async def achat(self) -> None:
+        """
+        Async variant of `chat()` for applications that already run an event loop.
+
+        Waiting for terminal input, model calls, and tool I/O all block, so
+        they run in worker threads via `asyncio.to_thread`. Other coroutines
+        keep running while the user is typing or the model is responding.
+        """
+        tool_schemas = self._tool_schemas
+
+        self._start_session()
+        await asyncio.to_thread(self._run_agentic_loop, tool_schemas)
+        while True:
+            respond = self._accept_user_input(await asyncio.to_thread(input, "You: "))
+            if respond is False:
+                break
+            if respond:
+                await asyncio.to_thread(self._run_agentic_loop, tool_schemas)
 
     def run(self, agent_input: GymTrainerInput) -> GymTrainerOutput:
         """Standard BaseAgent entry point — delegates to the interactive chat loop."""
-        self._data_dir = agent_input.data_dir
+        if agent_input.data_dir != self._data_dir:
+            self._data_dir = agent_input.data_dir
+            self._tool_instances.clear()  # rebuild tools against the new data_dir
         self.chat()
         return GymTrainerOutput()
\ No newline at end of file
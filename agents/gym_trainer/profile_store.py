@@ -0,0 +1,122 @@
+"""
+SQLite-backed UserProfile storage for bulk and batch workloads.
+
+The agent and its tools keep using the per-user JSON files in `user_profile`
+(plain files, no database required). When a batch job needs many profiles at
+once, one SQLite database avoids an open()/read()/close() per user and can
+return them all from a single query:
+
+    store = SQLiteProfileStore("data/profiles.db")
+    store.import_json_dir("data")  # one-time copy of data/profiles/*.json
+    profiles = store.load_many(["alex", "sam"])
+
+The database lives at whatever path you pass in. Its WAL journal lets other
+processes read while this one writes; within a process, one connection and a
+lock serialise every read and write.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List
+
+import orjson
+
+from agents.gym_trainer.user_profile import UserProfile
+
+# SQLite limits the number of "?" parameters in one statement (999 on older builds).
+_MAX_QUERY_PARAMS = 500
+
+
+class SQLiteProfileStore:
+    """
+    UserProfiles stored as JSON blobs in a single SQLite table keyed by user_id.
+
+    One connection is shared by all threads; a lock serialises access to it.
+    """
+
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode: each statement commits on its own unless wrapped
+        # in an explicit transaction (see import_json_dir).
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS profiles ("
+                "user_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at TEXT NOT NULL)"
+            )
+
+    def load(self, user_id: str) -> UserProfile:
+        """Load one profile. Raises KeyError if the user has none."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM profiles WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(user_id)
+        return UserProfile.model_validate_json(row[0])
+
+    def load_many(self, user_ids: Iterable[str]) -> Dict[str, UserProfile]:
+        """Load the profiles for *user_ids* that exist, keyed by user_id."""
+        ids: List[str] = list(dict.fromkeys(user_ids))
+        rows = []
+        with self._lock:
+            for start in range(0, len(ids), _MAX_QUERY_PARAMS):
+                batch = ids[start : start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows.extend(
+                    self._conn.execute(
+                        f"SELECT user_id, data FROM profiles WHERE user_id IN ({placeholders})",
+                        batch,
+                    )
+                )
+        return {user_id: UserProfile.model_validate_json(data) for user_id, data in rows}
+
+    def save(self, profile: UserProfile) -> None:
+        """Insert or replace *profile*, stamping its updated_at."""
+        profile.updated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles (user_id, data, updated_at) VALUES (?, ?, ?)",
+                (profile.user_id, orjson.dumps(profile.model_dump()), profile.updated_at),
+            )
+
+    def import_json_dir(self, data_dir: str) -> int:
+        """
+        Copy every data_dir/profiles/*.json profile into the database in one
+        transaction, replacing existing rows. Returns the number imported.
+        """
+        profiles_dir = os.path.join(data_dir, "profiles")
+        try:
+            names = [n for n in os.listdir(profiles_dir) if n.endswith(".json")]
+        except FileNotFoundError:
+            return 0
+
+        rows = []
+        for name in names:
+            with open(os.path.join(profiles_dir, name), "rb") as f:
+                profile = UserProfile.model_validate_json(f.read())
+            rows.append((profile.user_id, orjson.dumps(profile.model_dump()), profile.updated_at))
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO profiles (user_id, data, updated_at) VALUES (?, ?, ?)",
+                    rows,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
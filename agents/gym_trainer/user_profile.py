@@ -2,17 +2,36 @@
 User profile and workout session data models with JSON file persistence.
 
 Profiles are stored as:  data/profiles/{user_id}.json
-Progress history is stored as:  data/progress/{user_id}_progress.json
+Progress history is stored as:  data/progress/{user_id}_progress.jsonl
+(JSON Lines — one session per line, so logging a session is a single append.)
+Running totals are kept beside it in:  data/progress/{user_id}_progress.meta.json
 """
 
-import json
+import atexit
 import os
-from datetime import datetime
-from typing import List, Literal, Optional
+import threading
+from collections import OrderedDict, deque
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Literal, Optional, Set, Tuple
 
+import orjson
 from pydantic import BaseModel, Field
 
 
+def _utcnow_iso() -> str:
+    """Current UTC time as an ISO-8601 string, to the second."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _utc_today_iso() -> str:
+    """Current UTC date as an ISO-8601 string."""
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+# The default factories below only run when a field is missing, so loading
+# stored profiles and sessions never calls them.
+
+
 class UserProfile(BaseModel):
     """A gym user's personal profile used to tailor workouts."""
 
@@ -31,14 +50,14 @@ class UserProfile(BaseModel):
         description="Any injuries or physical limitations, e.g. ['lower back', 'left knee']",
     )
     sessions_per_week: int
-    created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = Field(default_factory=_utcnow_iso)
+    updated_at: str = Field(default_factory=_utcnow_iso)
 
 
 class WorkoutSession(BaseModel):
     """A single completed workout session logged by the user."""
 
-    date: str = Field(default_factory=lambda: datetime.utcnow().date().isoformat())
+    date: str = Field(default_factory=_utc_today_iso)
     focus_area: str
     duration_minutes: int
     exercises_completed: List[dict] = Field(
@@ -49,51 +68,326 @@ class WorkoutSession(BaseModel):
     notes: Optional[str] = None
 
 
+class ProgressStats(BaseModel):
+    """
+    Running totals for a user's progress history.
+
+    Updated on every save_session() so callers don't need to re-read the whole
+    history to count sessions or compute the streak.
+    """
+
+    total_sessions: int = 0
+    last_date: Optional[str] = None  # YYYY-MM-DD of the most recent session
+    run_days: int = 0  # consecutive days with a session, ending on last_date
+    file_size: int = 0  # size of the .jsonl file these totals describe
+
+    def streak_days(self) -> int:
+        """Current consecutive-day streak (today counts if there's a session)."""
+        return self.run_days if self.last_date == _utc_today_iso() else 0
+
+
 # ---------------------------------------------------------------------------
 # File I/O helpers
 # ---------------------------------------------------------------------------
 
 
-def _profiles_dir(data_dir: str) -> str:
-    path = os.path.join(data_dir, "profiles")
-    os.makedirs(path, exist_ok=True)
+# Parsed profiles keyed by (data_dir, user_id), stored with the file's
+# (mtime_ns, size) so an edit on disk invalidates the entry. Least recently
+# used entries are dropped beyond PROFILE_CACHE_SIZE.
+PROFILE_CACHE_SIZE = 128
+_PROFILE_CACHE: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], UserProfile]]" = OrderedDict()
+_PROFILE_CACHE_LOCK = threading.Lock()
+
+# Serialises writes so tools running in parallel never interleave output to
+# the same profile or progress file.
+_WRITE_LOCK = threading.Lock()
+
+
+def _file_version(filepath: str) -> Tuple[int, int]:
+    st = os.stat(filepath)
+    return st.st_mtime_ns, st.st_size
+
+
+def _cache_profile(key: Tuple[str, str], version: Tuple[int, int], profile: UserProfile) -> None:
+    with _PROFILE_CACHE_LOCK:
+        _PROFILE_CACHE[key] = (version, profile)
+        _PROFILE_CACHE.move_to_end(key)
+        if len(_PROFILE_CACHE) > PROFILE_CACHE_SIZE:
+            _PROFILE_CACHE.popitem(last=False)
+
+
+# Directories already created by this process, so makedirs() runs at most
+# once per path instead of on every file operation.
+_ENSURED_DIRS: Set[str] = set()
+
+# Progress files already checked for a legacy JSON array to migrate.
+_MIGRATION_CHECKED: Set[str] = set()
+
+
+# Directories whose entries changed (a rename or a new file) but have not been
+# fsync'd yet. They are flushed together, at most once per interval.
+DIR_FSYNC_INTERVAL_SECONDS: float = 5.0
+_DIRTY_DIRS: Set[str] = set()
+_DIRTY_DIRS_LOCK = threading.Lock()
+_dir_fsync_timer: Optional[threading.Timer] = None
+
+
+def _flush_dirty_dirs() -> None:
+    """
+    fsync every directory marked dirty, making recent renames durable.
+
+    Renamed files were fsync'd before the rename, so after a power loss a
+    renamed path shows either the old contents or the complete new ones.
+    Renames made since the last flush may be lost.
+    """
+    global _dir_fsync_timer
+    with _DIRTY_DIRS_LOCK:
+        dirs = list(_DIRTY_DIRS)
+        _DIRTY_DIRS.clear()
+        _dir_fsync_timer = None
+    for path in dirs:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:  # e.g. directories can't be opened on Windows
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _mark_dir_dirty(path: str) -> None:
+    """Schedule a batched fsync of *path* instead of syncing on every write."""
+    global _dir_fsync_timer
+    with _DIRTY_DIRS_LOCK:
+        _DIRTY_DIRS.add(path)
+        if _dir_fsync_timer is None:
+            _dir_fsync_timer = threading.Timer(DIR_FSYNC_INTERVAL_SECONDS, _flush_dirty_dirs)
+            _dir_fsync_timer.daemon = True
+            _dir_fsync_timer.start()
+
+
+atexit.register(_flush_dirty_dirs)
+
+
+def _ensure_dir(path: str) -> str:
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
     return path
 
 
+def _replace_file(path: str, payload: bytes, durable: bool = True) -> None:
+    """
+    Atomically replace *path* with *payload* via a temporary file and a rename.
+
+    With *durable* the data is fsync'd before the rename, so the new name
+    never points at unwritten data after a power loss. The temporary file is
+    removed if anything fails.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _profiles_dir(data_dir: str) -> str:
+    return _ensure_dir(os.path.join(data_dir, "profiles"))
+
+
 def _progress_dir(data_dir: str) -> str:
-    path = os.path.join(data_dir, "progress")
-    os.makedirs(path, exist_ok=True)
-    return path
+    return _ensure_dir(os.path.join(data_dir, "progress"))
 
 
 def save_profile(profile: UserProfile, data_dir: str) -> None:
-    """Persist a UserProfile to disk."""
-    profile.updated_at = datetime.utcnow().isoformat()
-    filepath = os.path.join(_profiles_dir(data_dir), f"{profile.user_id}.json")
-    with open(filepath, "w") as f:
-        json.dump(profile.model_dump(), f, indent=2)
+    """
+    Persist a UserProfile to disk.
+
+    The profile is written to a temporary file, fsync'd, and renamed over the
+    old one, so a crash mid-write never leaves a truncated profile behind.
+    The rename itself is made durable by the next batched directory fsync.
+    """
+    profile.updated_at = _utcnow_iso()
+    profiles_dir = _profiles_dir(data_dir)
+    filepath = os.path.join(profiles_dir, f"{profile.user_id}.json")
+    payload = orjson.dumps(profile.model_dump(), option=orjson.OPT_INDENT_2)
+    with _WRITE_LOCK:
+        _replace_file(filepath, payload)
+    _mark_dir_dirty(profiles_dir)
+    # Cache a copy so later in-place edits by the caller don't leak in.
+    _cache_profile(
+        (data_dir, profile.user_id), _file_version(filepath), profile.model_copy(deep=True)
+    )
 
 
 def load_profile(user_id: str, data_dir: str) -> UserProfile:
-    """Load a UserProfile from disk. Raises FileNotFoundError if not found."""
+    """
+    Load a UserProfile from disk. Raises FileNotFoundError if not found.
+
+    Parsed profiles are cached in memory and reused until the file changes,
+    so repeated loads during a session cost one stat() call. The returned
+    object may be shared with other callers — don't mutate it in place.
+    """
     filepath = os.path.join(_profiles_dir(data_dir), f"{user_id}.json")
-    with open(filepath) as f:
-        return UserProfile(**json.load(f))
+    key = (data_dir, user_id)
+    version = _file_version(filepath)
+    with _PROFILE_CACHE_LOCK:
+        cached = _PROFILE_CACHE.get(key)
+        if cached is not None and cached[0] == version:
+            _PROFILE_CACHE.move_to_end(key)
+            return cached[1]
+    with open(filepath, "rb") as f:
+        # Validate straight from the JSON bytes — no intermediate dict.
+        profile = UserProfile.model_validate_json(f.read())
+    _cache_profile(key, version, profile)
+    return profile
+
+
+def _progress_path(user_id: str, data_dir: str) -> str:
+    """Return the JSONL progress file path, migrating a legacy JSON array if present."""
+    progress_dir = _progress_dir(data_dir)
+    filepath = os.path.join(progress_dir, f"{user_id}_progress.jsonl")
+    if filepath in _MIGRATION_CHECKED:
+        return filepath
+    legacy_path = os.path.join(progress_dir, f"{user_id}_progress.json")
+    if not os.path.exists(filepath) and os.path.exists(legacy_path):
+        with open(legacy_path, "rb") as f:
+            sessions = orjson.loads(f.read())
+        # Written whole and renamed into place: a crash part-way must not leave
+        # a partial .jsonl, which would stop the migration from being retried.
+        _replace_file(filepath, b"".join(orjson.dumps(s) + b"\n" for s in sessions))
+        os.remove(legacy_path)
+    _MIGRATION_CHECKED.add(filepath)
+    return filepath
+
+
+def save_session(user_id: str, session: WorkoutSession, data_dir: str) -> ProgressStats:
+    """
+    Append a WorkoutSession to the user's progress history.
 
+    Returns the updated ProgressStats. They are normally advanced from the
+    stored totals; the history is only re-read when the totals are missing or
+    out of date (e.g. the file was edited by hand) or the session is back-dated.
+    """
+    filepath = _progress_path(user_id, data_dir)
+    line = orjson.dumps(session.model_dump()) + b"\n"
+    day = session.date[:10]
+    with _WRITE_LOCK:
+        stats = _load_stats(filepath)
+        with open(filepath, "ab+") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                # If an earlier append was cut short, end its line first so
+                # this session doesn't get glued onto it.
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            size = f.tell()
+        if stats is None or (stats.last_date is not None and day < stats.last_date):
+            stats = _rebuild_stats(filepath)
+        else:
+            stats.total_sessions += 1
+            if day != stats.last_date:
+                previous = date.fromisoformat(day) - timedelta(days=1)
+                consecutive = stats.last_date == previous.isoformat()
+                stats.run_days = stats.run_days + 1 if consecutive else 1
+                stats.last_date = day
+        stats.file_size = size
+        _write_stats(filepath, stats)
+    _mark_dir_dirty(os.path.dirname(filepath))
+    return stats
 
-def save_session(user_id: str, session: WorkoutSession, data_dir: str) -> None:
-    """Append a WorkoutSession to the user's progress history."""
-    filepath = os.path.join(_progress_dir(data_dir), f"{user_id}_progress.json")
-    sessions = load_sessions(user_id, data_dir)
-    sessions.append(session.model_dump())
-    with open(filepath, "w") as f:
-        json.dump(sessions, f, indent=2)
+
+def _stats_path(progress_path: str) -> str:
+    return progress_path[: -len(".jsonl")] + ".meta.json"
+
+
+def _load_stats(progress_path: str) -> Optional[ProgressStats]:
+    """Return the stored totals, or None if they don't match the progress file."""
+    try:
+        size = os.path.getsize(progress_path)
+    except FileNotFoundError:
+        return ProgressStats()
+    try:
+        with open(_stats_path(progress_path), "rb") as f:
+            stats = ProgressStats.model_validate_json(f.read())
+    except (FileNotFoundError, ValueError):
+        return None
+    return stats if stats.file_size == size else None
+
+
+def _rebuild_stats(progress_path: str) -> ProgressStats:
+    """Recompute the totals from the full progress file."""
+    with open(progress_path, "rb") as f:
+        dates = [s["date"][:10] for s in _parse_sessions(f)]
+    stats = ProgressStats(total_sessions=len(dates))
+    # ISO dates sort as strings; walk back from the latest while days are consecutive.
+    for d in sorted(set(dates), reverse=True):
+        if stats.last_date is None:
+            stats.last_date = d
+            expected = date.fromisoformat(d)
+        elif d != expected.isoformat():
+            break
+        stats.run_days += 1
+        expected -= timedelta(days=1)
+    return stats
+
+
+def _write_stats(progress_path: str, stats: ProgressStats) -> None:
+    # Not fsync'd: _load_stats() rejects a sidecar that doesn't match the
+    # progress file, and the totals are then rebuilt from it.
+    _replace_file(_stats_path(progress_path), orjson.dumps(stats.model_dump()), durable=False)
+
+
+def _parse_sessions(lines: Iterable[bytes]) -> List[dict]:
+    """
+    Parse JSON Lines session records.
+
+    Blank lines are ignored, and so is a line that doesn't parse: that can
+    only be a record cut short by an interrupted append.
+    """
+    sessions = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            sessions.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            continue
+    return sessions
 
 
 def load_sessions(user_id: str, data_dir: str) -> List[dict]:
     """Load all logged workout sessions for a user. Returns [] if none exist."""
-    filepath = os.path.join(_progress_dir(data_dir), f"{user_id}_progress.json")
-    if not os.path.exists(filepath):
+    try:
+        with open(_progress_path(user_id, data_dir), "rb") as f:
+            return _parse_sessions(f)
+    except FileNotFoundError:
+        return []
+
+
+def load_recent_sessions(user_id: str, data_dir: str, n: int) -> List[dict]:
+    """
+    Load only the user's last *n* sessions.
+
+    Lines are still read sequentially, but only the last *n* are kept and parsed.
+    """
+    try:
+        with open(_progress_path(user_id, data_dir), "rb") as f:
+            recent = deque((line for line in f if line.strip()), maxlen=n)
+    except FileNotFoundError:
         return []
-    with open(filepath) as f:
-        return json.load(f)
\ No newline at end of file
+    return _parse_sessions(recent)
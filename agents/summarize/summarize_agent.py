@@ -23,15 +23,28 @@ SummarizeOutput contains:
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
+import re
 import textwrap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
 from pydantic import Field
 
 from agents.base_agent import AgentInput, AgentOutput, BaseAgent
 from llm_clients.base_client import BaseLLMClient
-from tools.summarize_tool import MergeSummariesTool, SummarizeTool, SummarizeToolInput
+from tools.base_tool import BaseTool
+from tools.summarize_tool import (
+    MergeSummariesTool,
+    SummarizeTool,
+    SummarizeToolInput,
+    SummarizeToolOutput,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -78,6 +91,11 @@ class SummarizeOutput(AgentOutput):
 # most models' context windows even when the system prompt is included.
 DEFAULT_CHUNK_SIZE: int = 3_000
 DEFAULT_CHUNK_OVERLAP: int = 200  # overlap keeps context across chunk boundaries
+DEFAULT_MAX_PARALLEL_CHUNKS: int = 8  # concurrent chunk summaries (API rate limits apply)
+MEMORY_CACHE_SIZE: int = 512  # tool results kept in memory per agent
+
+# Where a sentence (or line) ends — chunk overlaps are trimmed back to one of these.
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s+|\n")
 
 
 class SummarizeAgent(BaseAgent[SummarizeInput, SummarizeOutput]):
@@ -91,8 +109,19 @@ class SummarizeAgent(BaseAgent[SummarizeInput, SummarizeOutput]):
     chunk_size : int
         Maximum characters per chunk when the input is too long.
     chunk_overlap : int
-        Characters shared between consecutive chunks to avoid losing context
-        at boundaries.
+        Maximum characters shared between consecutive chunks to avoid losing
+        context at boundaries.
+    max_parallel_chunks : int
+        How many chunk summaries may be in flight at once. Chunks are
+        independent until the merge step, so they are summarized concurrently;
+        use 1 to summarize them one after another.
+    cache_dir : Optional[str]
+        Directory for a persistent result cache. Tool results are cached in
+        memory, keyed by a hash of the model, temperature, tool and input;
+        when *cache_dir* is set they are also written there as JSON so
+        identical texts are not re-summarized across runs. Like the client's
+        own response cache, this only happens when the client's config allows
+        it (see BaseLLMClient.caches_responses): by default, at temperature 0.
 
     Example
     -------
@@ -112,10 +141,21 @@ class SummarizeAgent(BaseAgent[SummarizeInput, SummarizeOutput]):
         llm_client: BaseLLMClient,
         chunk_size: int = DEFAULT_CHUNK_SIZE,
         chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+        max_parallel_chunks: int = DEFAULT_MAX_PARALLEL_CHUNKS,
+        cache_dir: Optional[str] = None,
     ) -> None:
         super().__init__(llm_client)
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size.")
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.max_parallel_chunks = max(1, max_parallel_chunks)
+
+        self._cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._memory_cache: OrderedDict[str, SummarizeToolOutput] = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
 
         self._summarize_tool = SummarizeTool(llm_client)
         self._merge_tool = MergeSummariesTool(llm_client)
@@ -133,28 +173,33 @@ class SummarizeAgent(BaseAgent[SummarizeInput, SummarizeOutput]):
         status="failed" with error details in `summary` if an exception occurs.
         """
         text = agent_input.text
-        original_size = len(text)
-
         try:
             if self._needs_chunking(text):
                 result = self._summarize_chunked(text)
             else:
                 result = self._summarize_direct(text)
+        except Exception as exc:  # noqa: BLE001
+            return self._failed_output(exc, len(text))
+        return self._success_output(result, len(text))
 
-            return SummarizeOutput(
-                summary=result.summary,
-                key_takeaways=result.key_takeaways,
-                status=SummarizeStatus.SUCCESS,
-                original_content_size=original_size,
-            )
+    async def arun(self, agent_input: SummarizeInput) -> SummarizeOutput:
+        """
+        Async variant of run() for callers that already have an event loop.
 
+        Chunk summaries are awaited together with asyncio.gather (at most
+        `max_parallel_chunks` in flight) instead of on a thread pool.
+        """
+        text = agent_input.text
+        try:
+            if self._needs_chunking(text):
+                result = await self._asummarize_chunked(text)
+            else:
+                result = await self._arun_tool(
+                    self._summarize_tool, SummarizeToolInput(text=text, is_chunk=False)
+                )
         except Exception as exc:  # noqa: BLE001
-            return SummarizeOutput(
-                summary=f"Summarization failed: {exc}",
-                key_takeaways=[],
-                status=SummarizeStatus.FAILED,
-                original_content_size=original_size,
-            )
+            return self._failed_output(exc, len(text))
+        return self._success_output(result, len(text))
 
     # ------------------------------------------------------------------
     # Private helpers
@@ -168,24 +213,139 @@ class SummarizeAgent(BaseAgent[SummarizeInput, SummarizeOutput]):
         """
         Split *text* into overlapping chunks.
 
-        Each chunk is at most `chunk_size` characters long. Consecutive chunks
-        share `chunk_overlap` characters so that sentences cut at a boundary
-        still appear in full in at least one chunk.
+        Each chunk is at most `chunk_size` characters long. The next chunk
+        starts at the beginning of the sentence that was cut at the boundary,
+        so that sentence still appears in full — but only it is repeated, not
+        a fixed `chunk_overlap` characters. Every overlapping character is
+        billed twice by the LLM. If no sentence break falls within the last
+        `chunk_overlap` characters, the full overlap is used.
         """
+        # Everything the loop touches is bound to a local up front.
+        size = self.chunk_size
+        overlap = self.chunk_overlap
+        n = len(text)
+        find_breaks = _SENTENCE_END.finditer
+
         chunks: List[str] = []
+        append = chunks.append
         start = 0
-        while start < len(text):
-            end = start + self.chunk_size
-            chunks.append(text[start:end])
-            start = end - self.chunk_overlap  # slide back by overlap
-            if start >= len(text):
-                break
-        return chunks
+        while True:
+            end = start + size
+            append(text[start:end])
+            if end >= n:
+                return chunks
+            start = end - overlap
+            for match in find_breaks(text, start, end):
+                start = match.end()
+
+    def _cache_key(self, tool: BaseTool, tool_input: SummarizeToolInput) -> Optional[str]:
+        """Return the result-cache key for *tool_input*, or None if caching is off."""
+        if not self.llm_client.caches_responses:
+            return None
+        config = self.llm_client.config
+        # Collapse whitespace so re-runs of the same document that differ only
+        # in line wrapping or indentation still hit the cache.
+        text = " ".join(tool_input.text.split())
+        raw = (
+            f"{config.model}|{config.temperature}|{tool.__class__.__name__}|"
+            f"{tool_input.is_chunk}|{text}"
+        )
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _run_tool(self, tool: BaseTool, tool_input: SummarizeToolInput) -> SummarizeToolOutput:
+        """
+        Run *tool*, returning a cached result when the same input was seen before.
+
+        Lookup order: in-memory LRU, then `cache_dir` (if set), then the LLM.
+        """
+        key = self._cache_key(tool, tool_input)
+        if key is None:
+            return tool.run(tool_input)
+        result = self._cache_get(key)
+        if result is None:
+            result = tool.run(tool_input)
+            self._cache_put(key, result, write_disk=True)
+        return result
+
+    async def _arun_tool(
+        self, tool: BaseTool, tool_input: SummarizeToolInput
+    ) -> SummarizeToolOutput:
+        """Async variant of _run_tool(), awaiting tool.arun() on a cache miss."""
+        key = self._cache_key(tool, tool_input)
+        if key is None:
+            return await tool.arun(tool_input)
+        result = self._cache_get(key)
+        if result is None:
+            result = await tool.arun(tool_input)
+            self._cache_put(key, result, write_disk=True)
+        return result
+
+    def _cache_get(self, key: str) -> Optional[SummarizeToolOutput]:
+        with self._memory_cache_lock:
+            cached = self._memory_cache.get(key)
+            if cached is not None:
+                self._memory_cache.move_to_end(key)
+                return cached
+
+        path = self._cache_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                result = SummarizeToolOutput.model_validate_json(f.read())
+        except (OSError, ValueError):
+            # Missing, unreadable or corrupt: treat it as a miss, and the
+            # fresh result will overwrite it.
+            return None
+        self._cache_put(key, result, write_disk=False)
+        return result
+
+    def _cache_put(self, key: str, result: SummarizeToolOutput, write_disk: bool) -> None:
+        path = self._cache_path(key)
+        if write_disk and path:
+            # Write then rename so a concurrent reader never sees a partial file.
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(result.model_dump_json().encode())
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+        with self._memory_cache_lock:
+            self._memory_cache[key] = result
+            if len(self._memory_cache) > MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+
+    def _cache_path(self, key: str) -> Optional[str]:
+        return os.path.join(self._cache_dir, f"{key}.json") if self._cache_dir else None
+
+    @staticmethod
+    def _success_output(result: SummarizeToolOutput, original_size: int) -> SummarizeOutput:
+        return SummarizeOutput(
+            summary=result.summary,
+            key_takeaways=result.key_takeaways,
+            status=SummarizeStatus.SUCCESS,
+            original_content_size=original_size,
+        )
+
+    @staticmethod
+    def _failed_output(exc: Exception, original_size: int) -> SummarizeOutput:
+        return SummarizeOutput(
+            summary=f"Summarization failed: {exc}",
+            key_takeaways=[],
+            status=SummarizeStatus.FAILED,
+            original_content_size=original_size,
+        )
 
     def _summarize_direct(self, text: str):
         """Summarize a short text in a single LLM call."""
-        return self._summarize_tool.run(
-            SummarizeToolInput(text=text, is_chunk=False)
+        return self._run_tool(
+            self._summarize_tool, SummarizeToolInput(text=text, is_chunk=False)
         )
 
     def _summarize_chunked(self, text: str):
@@ -195,17 +355,39 @@ class SummarizeAgent(BaseAgent[SummarizeInput, SummarizeOutput]):
         """
         chunks = self._chunk_text(text)
 
-        chunk_summaries: List[str] = []
-        for i, chunk in enumerate(chunks, start=1):
-            chunk_result = self._summarize_tool.run(
-                SummarizeToolInput(text=chunk, is_chunk=True)
-            )
-            chunk_summaries.append(
-                f"--- Chunk {i} of {len(chunks)} ---\n{chunk_result.summary}"
+        # Chunk summaries are independent network calls, so overlap them.
+        # map() keeps results in chunk order.
+        workers = min(len(chunks), self.max_parallel_chunks)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            chunk_results = list(
+                executor.map(
+                    lambda chunk: self._run_tool(
+                        self._summarize_tool, SummarizeToolInput(text=chunk, is_chunk=True)
+                    ),
+                    chunks,
+                )
             )
 
-        combined = "\n\n".join(chunk_summaries)
-        merged = self._merge_tool.run(
-            SummarizeToolInput(text=combined, is_chunk=False)
-        )
-        return merged
+        return self._run_tool(self._merge_tool, self._merge_input(chunk_results))
+
+    async def _asummarize_chunked(self, text: str) -> SummarizeToolOutput:
+        """Async variant of _summarize_chunked()."""
+        chunks = self._chunk_text(text)
+        limit = asyncio.Semaphore(self.max_parallel_chunks)
+
+        async def summarize_chunk(chunk: str) -> SummarizeToolOutput:
+            async with limit:
+                return await self._arun_tool(
+                    self._summarize_tool, SummarizeToolInput(text=chunk, is_chunk=True)
+                )
+
+        chunk_results = await asyncio.gather(*(summarize_chunk(c) for c in chunks))
+        return await self._arun_tool(self._merge_tool, self._merge_input(chunk_results))
+
+    @staticmethod
+    def _merge_input(chunk_results: List[SummarizeToolOutput]) -> SummarizeToolInput:
+        chunk_summaries: List[str] = [
+            f"--- Chunk {i} of {len(chunk_results)} ---\n{chunk_result.summary}"
+            for i, chunk_result in enumerate(chunk_results, start=1)
+        ]
+        return SummarizeToolInput(text="\n\n".join(chunk_summaries), is_chunk=False)
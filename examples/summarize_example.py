@@ -82,7 +82,10 @@ def main() -> None:
     client = AnthropicClient(config, api_key=settings.anthropic_api_key)
 
     # chunk_size=3000 means texts ≤ 3 000 chars are handled in one call.
-    agent = SummarizeAgent(client, chunk_size=3_000, chunk_overlap=200)
+    # cache_dir lets re-runs of this demo reuse earlier results instead of
+    # calling the API again for the same texts.
+    cache_dir = os.path.join(os.path.dirname(__file__), "..", "data", "cache", "summaries")
+    agent = SummarizeAgent(client, chunk_size=3_000, chunk_overlap=200, cache_dir=cache_dir)
 
     print("\n=== Summarize Agent Demo ===")
 
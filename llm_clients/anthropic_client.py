@@ -5,12 +5,62 @@ Uses the official `anthropic` Python SDK.  Install it with:
     pip install anthropic
 """
 
-import json
-from typing import List
+import asyncio
+import email.utils
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 import anthropic
+import httpx
+import orjson
 
-from llm_clients.base_client import BaseLLMClient, LLMConfig, LLMResponse, Message, ToolCall
+from llm_clients.base_client import (
+    BaseLLMClient,
+    LLMConfig,
+    LLMResponse,
+    Message,
+    ModelT,
+    ResponseT,
+    StreamEvent,
+    ToolCall,
+)
+
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+# Status codes worth retrying, besides 5xx; the same set the SDK itself retries.
+_RETRYABLE_STATUS = frozenset({408, 409, 429})
+
+# Longest server-requested retry delay that is honoured.
+_MAX_RETRY_AFTER = 60.0
+
+
+def _retry_after(headers) -> Optional[float]:
+    """
+    The delay a `retry-after-ms` or `retry-after` header (seconds or an HTTP
+    date) asks for, capped at _MAX_RETRY_AFTER; None if absent or unusable.
+    """
+    try:
+        if "retry-after-ms" in headers:
+            seconds = float(headers["retry-after-ms"]) / 1000
+        elif "retry-after" in headers:
+            value = headers["retry-after"]
+            try:
+                seconds = float(value)
+            except ValueError:
+                seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        else:
+            return None
+    except (TypeError, ValueError):
+        return None
+    if seconds != seconds:  # NaN
+        return None
+    return min(max(seconds, 0.0), _MAX_RETRY_AFTER)
+
+
+# id(schema) -> (schema, rendered JSON instruction); see _json_instruction().
+_JSON_INSTRUCTIONS: Dict[int, Tuple[dict, str]] = {}
+_JSON_INSTRUCTIONS_MAX = 64
 
 
 class AnthropicClient(BaseLLMClient):
@@ -24,58 +74,207 @@ class AnthropicClient(BaseLLMClient):
     reply  = client.complete([Message(role="user", content="Hello!")])
     """
 
-    def __init__(self, config: LLMConfig, api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        config: LLMConfig,
+        api_key: str | None = None,
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
         super().__init__(config)
         # api_key=None lets the SDK fall back to the ANTHROPIC_API_KEY env var.
-        self._client = anthropic.Anthropic(api_key=api_key)
+        # Each SDK client keeps one pooled, keep-alive httpx client for its whole
+        # lifetime, so connections (and their TLS sessions) are reused across
+        # calls. Pass http_client / async_http_client to share one pool between
+        # several AnthropicClients or to tune its limits and timeouts.
+        #
+        # The SDK's own retries are off: _request() retries instead, so that
+        # config.request_timeout bounds the whole call rather than each attempt.
+        self._client = anthropic.Anthropic(api_key=api_key, http_client=http_client, max_retries=0)
+        # Used by the async methods. It keeps its own connection pool, so use
+        # it from one event loop at a time.
+        self._async_client = anthropic.AsyncAnthropic(
+            api_key=api_key, http_client=async_http_client, max_retries=0
+        )
+        # Pools passed in belong to the caller; close()/aclose() leave them open.
+        self._owns_http_client = http_client is None
+        self._owns_async_http_client = async_http_client is None
+        # (tools list as passed in, copy with the cache breakpoint); see _prepare_tools().
+        self._prepared_tools: Tuple[Optional[List[dict]], List[dict]] = (None, [])
 
-    def complete(self, messages: List[Message]) -> str:
+    def complete(self, messages: List[Message], system: Optional[str] = None) -> str:
         """Return the model's plain-text reply."""
         formatted = [{"role": m.role, "content": m.content} for m in messages]
-
-        kwargs = dict(
-            model=self.config.model,
-            max_tokens=self.config.max_tokens,
-            temperature=self.config.temperature,
-            messages=formatted,
+        return self.cached(
+            lambda: self._create_text(formatted, self._system_param(system)),
+            "complete", formatted, system,
         )
-        if self.config.system_prompt:
-            kwargs["system"] = self.config.system_prompt
 
-        response = self._client.messages.create(**kwargs)
-        return response.content[0].text
+    def complete_stream(
+        self, messages: List[Message], system: Optional[str] = None
+    ) -> Iterator[str]:
+        """Yield the model's plain-text reply piece by piece as it is generated."""
+        formatted = [{"role": m.role, "content": m.content} for m in messages]
+        return self._stream_text(formatted, self._system_param(system))
 
-    def complete_json(self, messages: List[Message], schema: dict) -> dict:
+    def complete_json(
+        self,
+        messages: List[Message],
+        schema: dict,
+        *,
+        system: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> dict:
         """
         Ask Claude to respond with JSON matching *schema*.
 
-        The method appends an instruction to the last user message and then
-        parses the response back into a Python dict.
+        The JSON instruction is sent as a system block after the system prompt,
+        so with prompt caching on, repeated calls with the same schema reuse
+        the cached prefix instead of re-reading it. The reply is parsed back
+        into a Python dict.
+
+        When *on_token* is given the reply is streamed and each text delta is
+        passed to it before the complete JSON is parsed; streamed calls bypass
+        the response cache.
         """
-        schema_str = json.dumps(schema, indent=2)
-        json_instruction = (
-            f"\n\nRespond ONLY with valid JSON that matches this schema:\n{schema_str}"
-            "\nDo not include any explanation or markdown code fences."
+        json_instruction = self._json_instruction(schema)
+        formatted = [{"role": m.role, "content": m.content} for m in messages]
+        system_param = self._system_param(system, json_instruction)
+        if on_token is not None:
+            return self._parse_json(self._collect_stream(formatted, system_param, on_token))
+
+        return self.cached(
+            lambda: self._parse_json(self._create_text(formatted, system_param)),
+            "complete_json", formatted, system, schema,
         )
 
-        augmented = list(messages)
-        if augmented and augmented[-1].role == "user":
-            augmented[-1] = Message(
-                role="user",
-                content=augmented[-1].content + json_instruction,
+    def complete_json_stream(
+        self, messages: List[Message], schema: dict, *, system: Optional[str] = None
+    ) -> Iterator[str]:
+        """Yield the raw JSON reply (possibly fenced) piece by piece as it is generated."""
+        formatted = [{"role": m.role, "content": m.content} for m in messages]
+        return self._stream_text(formatted, self._system_param(system, self._json_instruction(schema)))
+
+    def complete_model(
+        self,
+        messages: List[Message],
+        output_type: Type[ModelT],
+        *,
+        schema: Optional[dict] = None,
+        system: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        cache_key: Optional[Tuple[Any, ...]] = None,
+    ) -> ModelT:
+        """
+        Ask Claude for JSON and validate it straight into *output_type*.
+
+        The reply text goes to `model_validate_json()`, which parses and
+        validates in one pass without building an intermediate dict.
+        *cache_key*, when given, stands in for the messages in the
+        response-cache key.
+        """
+        if schema is None:
+            schema = output_type.model_json_schema()
+        formatted = [{"role": m.role, "content": m.content} for m in messages]
+        system_param = self._system_param(system, self._json_instruction(schema))
+        if on_token is not None:
+            raw = self._collect_stream(formatted, system_param, on_token)
+            return output_type.model_validate_json(self._strip_fences(raw))
+
+        return self.cached(
+            lambda: output_type.model_validate_json(
+                self._strip_fences(self._create_text(formatted, system_param))
+            ),
+            "complete_model", output_type.__qualname__,
+            formatted if cache_key is None else cache_key, system, schema,
+        )
+
+    async def acomplete_json(
+        self,
+        messages: List[Message],
+        schema: dict,
+        *,
+        system: Optional[str] = None,
+        cache_key: Optional[Tuple[Any, ...]] = None,
+    ) -> dict:
+        """
+        Async variant of complete_json() using the SDK's async client.
+
+        *cache_key* is as for complete_model().
+        """
+        formatted = [{"role": m.role, "content": m.content} for m in messages]
+        kwargs = self._text_kwargs(
+            formatted, self._system_param(system, self._json_instruction(schema))
+        )
+
+        async def create() -> dict:
+            response = await self._arequest(
+                lambda timeout: self._async_client.messages.create(**kwargs, timeout=timeout)
             )
+            return self._parse_json(response.content[0].text)
 
-        raw = self.complete(augmented)
+        return await self.acached(
+            create,
+            "complete_json", formatted if cache_key is None else cache_key, system, schema,
+        )
 
-        # Strip accidental markdown fences if the model adds them anyway.
-        raw = raw.strip()
-        if raw.startswith("```"):
-            raw = raw.split("\n", 1)[-1]
-            raw = raw.rsplit("```", 1)[0]
+    def complete_json_batch(
+        self,
+        batch: List[List[Message]],
+        schema: dict,
+        *,
+        system: Optional[str] = None,
+        poll_interval: float = 10.0,
+    ) -> List[dict]:
+        """
+        Run many complete_json() requests through the Message Batches API.
+
+        Batches are billed at a discount and are not rate-limited like
+        individual calls, but they complete asynchronously: this method polls
+        every *poll_interval* seconds and may block for minutes. Use it for
+        offline bulk work, not interactive requests.
+
+        Raises RuntimeError if any request in the batch did not succeed.
+        """
+        if not batch:
+            return []
+        system_param = self._system_param(system, self._json_instruction(schema))
+        requests = [
+            {
+                "custom_id": f"req-{i}",
+                "params": self._text_kwargs(
+                    [{"role": m.role, "content": m.content} for m in messages], system_param
+                ),
+            }
+            for i, messages in enumerate(batch)
+        ]
+        batches = self._client.messages.batches
+        message_batch = self._request(
+            lambda timeout: batches.create(requests=requests, timeout=timeout)
+        )
+        while message_batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            message_batch = self._request(
+                lambda timeout: batches.retrieve(message_batch.id, timeout=timeout)
+            )
 
-        return json.loads(raw)
+        results: List[Optional[dict]] = [None] * len(batch)
+        entries = self._request(lambda timeout: batches.results(message_batch.id, timeout=timeout))
+        for entry in entries:
+            if entry.result.type != "succeeded":
+                raise RuntimeError(
+                    f"Batch request {entry.custom_id} did not succeed: {entry.result.type}"
+                )
+            index = int(entry.custom_id.split("-", 1)[1])
+            results[index] = self._parse_json(entry.result.message.content[0].text)
+        return results
 
-    def complete_with_tools(self, messages: List[dict], tools: List[dict]) -> LLMResponse:
+    def complete_with_tools(
+        self,
+        messages: List[dict],
+        tools: Optional[List[dict]] = None,
+        system: Optional[str] = None,
+    ) -> LLMResponse:
         """
         Call Claude with tool definitions and return a structured LLMResponse.
 
@@ -83,8 +282,226 @@ class AnthropicClient(BaseLLMClient):
         Content may be a plain string or a list of content blocks (for tool use).
 
         *tools* is a list of Anthropic tool schema dicts with keys:
-            name, description, input_schema.
+            name, description, input_schema. Defaults to the bound tools.
+
+        *system* overrides `config.system_prompt` for this request only.
+        """
+        kwargs = self._tool_kwargs(messages, tools, system)
+        response = self._request(
+            lambda timeout: self._client.messages.create(**kwargs, timeout=timeout)
+        )
+        return self._to_llm_response(response)
+
+    def complete_with_tools_stream(
+        self,
+        messages: List[dict],
+        tools: Optional[List[dict]] = None,
+        system: Optional[str] = None,
+    ) -> Iterator[StreamEvent]:
         """
+        Stream a tool-calling request, yielding text deltas as they arrive.
+
+        The SDK's stream helper accumulates every content block (including the
+        partial JSON of tool_use inputs), so the final "message_stop" event
+        carries the same LLMResponse that complete_with_tools() would return.
+        """
+        with self._open_stream(self._tool_kwargs(messages, tools, system)) as stream:
+            for event in stream:
+                if event.type == "text" and event.text:
+                    yield StreamEvent(type="text_delta", text=event.text)
+            response = stream.get_final_message()
+        yield StreamEvent(type="message_stop", response=self._to_llm_response(response))
+
+    def close(self) -> None:
+        """
+        Close the sync connection pool if this client created it.
+
+        An http_client passed to the constructor may be shared with other
+        clients, so it is left open; closing it is up to the caller.
+        """
+        if self._owns_http_client:
+            self._client.close()
+
+    async def aclose(self) -> None:
+        """Async variant of close() for the async connection pool."""
+        if self._owns_async_http_client:
+            await self._async_client.close()
+
+    @staticmethod
+    def _json_instruction(schema: dict) -> str:
+        # Tools pass module-level schema constants, so the same dict object
+        # comes back on every call: remember its rendered instruction by id().
+        # The entry keeps the schema alive, so an id can't be reused while cached.
+        entry = _JSON_INSTRUCTIONS.get(id(schema))
+        if entry is not None and entry[0] is schema:
+            return entry[1]
+
+        # Compact: the model reads the schema fine without indentation.
+        schema_str = orjson.dumps(schema).decode()
+        instruction = (
+            f"Respond ONLY with valid JSON that matches this schema:\n{schema_str}"
+            "\nDo not include any explanation or markdown code fences."
+        )
+        if len(_JSON_INSTRUCTIONS) >= _JSON_INSTRUCTIONS_MAX:
+            _JSON_INSTRUCTIONS.clear()
+        _JSON_INSTRUCTIONS[id(schema)] = (schema, instruction)
+        return instruction
+
+    @classmethod
+    def _parse_json(cls, raw: str) -> dict:
+        return orjson.loads(cls._strip_fences(raw))
+
+    @staticmethod
+    def _strip_fences(raw: str) -> str:
+        # Strip accidental markdown fences if the model adds them anyway.
+        # Sliced by index so large replies aren't copied more than once.
+        raw = raw.strip()
+        if raw.startswith("```"):
+            newline = raw.find("\n")
+            end = raw.rfind("```")
+            raw = raw[newline + 1 : end if end > newline else None]
+        return raw
+
+    def _collect_stream(
+        self,
+        messages: List[dict],
+        system: Union[str, List[dict], None],
+        on_token: Callable[[str], None],
+    ) -> str:
+        pieces = []
+        for text in self._stream_text(messages, system):
+            on_token(text)
+            pieces.append(text)
+        return "".join(pieces)
+
+    def _create_text(self, messages: List[dict], system: Union[str, List[dict], None]) -> str:
+        kwargs = self._text_kwargs(messages, system)
+        response = self._request(
+            lambda timeout: self._client.messages.create(**kwargs, timeout=timeout)
+        )
+        return response.content[0].text
+
+    def _stream_text(
+        self, messages: List[dict], system: Union[str, List[dict], None]
+    ) -> Iterator[str]:
+        with self._open_stream(self._text_kwargs(messages, system)) as stream:
+            yield from stream.text_stream
+
+    def _open_stream(self, kwargs: dict):
+        """
+        Start a streamed request, retrying like _request() until it is open.
+
+        Once events are flowing nothing is retried (the caller may already
+        have used part of the reply), and the remaining deadline only bounds
+        each read, not the whole stream.
+        """
+        return self._request(
+            lambda timeout: self._client.messages.stream(**kwargs, timeout=timeout).__enter__()
+        )
+
+    def _request(self, send: Callable[[float], ResponseT]) -> ResponseT:
+        """
+        Return send(timeout), retrying transient API errors with jittered
+        exponential backoff (0.5 s doubling up to 8 s), or after the delay the
+        server asked for (see _retry_delay()).
+
+        Gives up after `config.max_retries` retries, or as soon as the next
+        attempt could not start before `config.request_timeout` seconds have
+        passed since the first one; *timeout* is the time left until then.
+        """
+        deadline = time.monotonic() + self.config.request_timeout
+        attempt = 0
+        while True:
+            try:
+                return send(deadline - time.monotonic())
+            except anthropic.APIError as exc:
+                delay = self._retry_delay(exc, attempt, deadline)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def _arequest(self, send: Callable[[float], Awaitable[ResponseT]]) -> ResponseT:
+        """Async variant of _request()."""
+        deadline = time.monotonic() + self.config.request_timeout
+        attempt = 0
+        while True:
+            try:
+                return await send(deadline - time.monotonic())
+            except anthropic.APIError as exc:
+                delay = self._retry_delay(exc, attempt, deadline)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(
+        self, exc: anthropic.APIError, attempt: int, deadline: float
+    ) -> Optional[float]:
+        """
+        Seconds to wait before retrying after *exc*, or None to give up.
+
+        The server's hints win over the defaults, as in the SDK: an
+        `x-should-retry` header decides whether to retry at all, and
+        `retry-after-ms` / `retry-after` (capped at 60 s) replace the backoff.
+        """
+        if attempt >= self.config.max_retries:
+            return None
+        response = getattr(exc, "response", None)
+        headers = response.headers if response is not None else {}
+        should_retry = headers.get("x-should-retry")
+        if should_retry == "false":
+            return None
+        if should_retry != "true":
+            if isinstance(exc, anthropic.APIStatusError):
+                if exc.status_code not in _RETRYABLE_STATUS and exc.status_code < 500:
+                    return None
+            elif not isinstance(exc, anthropic.APIConnectionError):  # includes timeouts
+                return None
+        delay = _retry_after(headers)
+        if delay is None:
+            delay = min(8.0, 0.5 * 2**attempt) * random.uniform(0.75, 1.0)
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def _text_kwargs(self, messages: List[dict], system: Union[str, List[dict], None]) -> dict:
+        kwargs = dict(
+            model=self.config.model,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            messages=messages,
+        )
+        if system:
+            kwargs["system"] = system
+        return kwargs
+
+    def bind_tools(self, tools: List[dict]) -> None:
+        """Bind *tools* as the default tool set, preparing them for caching now."""
+        super().bind_tools(tools)
+        self._prepare_tools(tools)
+
+    def _prepare_tools(self, tools: List[dict]) -> List[dict]:
+        """
+        Return *tools* with a prompt-cache breakpoint on the last definition.
+
+        A breakpoint on the last tool caches every tool definition. The input
+        is copied (callers pass shared, read-only schema dicts), and the copy
+        is reused for as long as the caller keeps passing the same list, which
+        agents with a fixed tool registry do on every turn.
+        """
+        if not tools or not self.config.use_prompt_cache:
+            return tools
+        source, prepared = self._prepared_tools
+        if source is not tools:
+            prepared = [*tools[:-1], {**tools[-1], "cache_control": _EPHEMERAL_CACHE}]
+            self._prepared_tools = (tools, prepared)
+        return prepared
+
+    def _tool_kwargs(
+        self, messages: List[dict], tools: Optional[List[dict]], system: Optional[str]
+    ) -> dict:
+        tools = self._prepare_tools(self._resolve_tools(tools))
         kwargs = dict(
             model=self.config.model,
             max_tokens=self.config.max_tokens,
@@ -92,11 +509,34 @@ class AnthropicClient(BaseLLMClient):
             messages=messages,
             tools=tools,
         )
-        if self.config.system_prompt:
-            kwargs["system"] = self.config.system_prompt
+        system = self._system_param(system)
+        if system:
+            kwargs["system"] = system
+        return kwargs
 
-        response = self._client.messages.create(**kwargs)
+    def _system_param(
+        self, system: Optional[str], *extra: str
+    ) -> Union[str, List[dict], None]:
+        """
+        Build the `system` request parameter from the prompt plus *extra* blocks.
+
+        With `config.use_prompt_cache` on, the blocks are sent in structured
+        form with a cache breakpoint on the last one, so Claude can reuse the
+        cached prefix on the next call. Prompts shorter than the model's
+        minimum cacheable length are simply not cached by the API.
+        """
+        parts = [p for p in (system or self.config.system_prompt, *extra) if p]
+        if not parts:
+            return None
+        if not self.config.use_prompt_cache:
+            return "\n\n".join(parts)
+        blocks = [{"type": "text", "text": p} for p in parts]
+        blocks[-1]["cache_control"] = _EPHEMERAL_CACHE
+        return blocks
 
+    @staticmethod
+    def _to_llm_response(response) -> LLMResponse:
+        """Convert an Anthropic Message into the provider-agnostic LLMResponse."""
         text = ""
         tool_calls: List[ToolCall] = []
 
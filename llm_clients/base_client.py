@@ -6,12 +6,25 @@ agents and tools are decoupled from any specific provider. Swapping the
 underlying model is a one-line change in your agent.
 """
 
+import asyncio
+import copy
+import hashlib
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, List, Optional
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Tuple, Type, TypeVar
 
+import orjson
+from pydantic import BaseModel
 
-@dataclass
+ResponseT = TypeVar("ResponseT")
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@dataclass(slots=True)
 class Message:
     """A single message in a conversation."""
 
@@ -19,7 +32,7 @@ class Message:
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMConfig:
     """Configuration shared across all LLM clients."""
 
@@ -27,9 +40,23 @@ class LLMConfig:
     max_tokens: int = 4096
     temperature: float = 0.3
     system_prompt: Optional[str] = None
+    # Ask providers that support it to cache the stable prompt prefix
+    # (system prompt, tool definitions, JSON schema) between calls.
+    use_prompt_cache: bool = True
+    # Identical requests are answered from an in-process cache when the
+    # temperature is 0. Set cache_nondeterministic to cache at any temperature,
+    # or response_cache_size to 0 to disable the cache.
+    cache_nondeterministic: bool = False
+    response_cache_size: int = 256
+    response_cache_ttl: float = 3600.0  # seconds
+    # Deadline (seconds) for one request, retries and the backoff between them
+    # included, and how many times a request that failed transiently
+    # (connection error, timeout, 408/409/429, 5xx) is retried within it.
+    request_timeout: float = 300.0
+    max_retries: int = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     """A single tool call requested by the model."""
 
@@ -38,7 +65,7 @@ class ToolCall:
     tool_input: dict
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     """Structured response from complete_with_tools()."""
 
@@ -48,6 +75,15 @@ class LLMResponse:
     raw_content: Any            # provider-specific raw content for re-insertion into history
 
 
+@dataclass(slots=True)
+class StreamEvent:
+    """A single event yielded by complete_with_tools_stream()."""
+
+    type: str                               # "text_delta" | "message_stop"
+    text: str = ""                          # the new text for "text_delta" events
+    response: Optional[LLMResponse] = None  # the full response for "message_stop"
+
+
 class BaseLLMClient(ABC):
     """
     Abstract interface for LLM providers.
@@ -58,22 +94,143 @@ class BaseLLMClient(ABC):
 
     def __init__(self, config: LLMConfig) -> None:
         self.config = config
+        # key -> (expiry on the monotonic clock, response), oldest first.
+        self._response_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        self._bound_tools: Optional[List[dict]] = None
 
     @abstractmethod
-    def complete(self, messages: List[Message]) -> str:
+    def complete(self, messages: List[Message], system: Optional[str] = None) -> str:
         """
         Send a list of messages to the model and return the assistant reply as
         a plain string.
+
+        *system*, when given, is used as the system prompt for this call only
+        instead of `config.system_prompt`.
         """
 
     @abstractmethod
-    def complete_json(self, messages: List[Message], schema: dict) -> dict:
+    def complete_json(
+        self,
+        messages: List[Message],
+        schema: dict,
+        *,
+        system: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> dict:
         """
         Send messages and instruct the model to reply with JSON that conforms
         to *schema*.  Returns the parsed dict.
+
+        *system* overrides `config.system_prompt` for this call only, so
+        concurrent callers sharing one client never see each other's prompt.
+        It is keyword-only; tools should pass their prompt here rather than
+        assigning to the shared `config`.
+
+        *on_token*, when given, is called with each piece of the raw reply as
+        it is generated. Providers that cannot stream may call it once with
+        the whole reply, or not at all.
+        """
+
+    def complete_model(
+        self,
+        messages: List[Message],
+        output_type: Type[ModelT],
+        *,
+        schema: Optional[dict] = None,
+        system: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        cache_key: Optional[Tuple[Any, ...]] = None,
+    ) -> ModelT:
+        """
+        Like complete_json(), but return the reply validated as *output_type*.
+
+        *schema* defaults to output_type's JSON schema; pass a hand-written one
+        to keep the instruction short. The default implementation validates the
+        dict from complete_json(). Providers that have the raw reply text
+        should override it to parse and validate in one pass with
+        `model_validate_json()`.
+
+        *cache_key*, when given, replaces the messages in the response-cache
+        key (see cached()). Tools pass their normalised input here so that
+        requests worded differently but asking the same thing share an entry.
+        The default implementation ignores it.
+        """
+        if schema is None:
+            schema = output_type.model_json_schema()
+        return output_type.model_validate(
+            self.complete_json(messages, schema, system=system, on_token=on_token)
+        )
+
+    async def acomplete_json(
+        self,
+        messages: List[Message],
+        schema: dict,
+        *,
+        system: Optional[str] = None,
+        cache_key: Optional[Tuple[Any, ...]] = None,
+    ) -> dict:
+        """
+        Async variant of complete_json(); *cache_key* is as for complete_model().
+
+        The default implementation runs complete_json() in a worker thread.
+        Providers with an async SDK should override it so that many requests
+        can be awaited together without a thread each.
+        """
+        return await asyncio.to_thread(self.complete_json, messages, schema, system=system)
+
+    def complete_json_batch(
+        self,
+        batch: List[List[Message]],
+        schema: dict,
+        *,
+        system: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Run complete_json() for every conversation in *batch*, all sharing
+        *schema* and *system*. Results are returned in input order.
+
+        The default implementation runs the requests concurrently on a thread
+        pool. Providers with a bulk API may override it to trade latency for
+        throughput and cost.
+        """
+        if not batch:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(batch), 8)) as pool:
+            return list(
+                pool.map(lambda msgs: self.complete_json(msgs, schema, system=system), batch)
+            )
+
+    def complete_json_stream(
+        self, messages: List[Message], schema: dict, *, system: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Like complete_json(), but yield the raw JSON text as it is generated.
+
+        Callers are responsible for parsing the concatenated pieces. The
+        default implementation does not stream: it yields the serialised
+        result of complete_json() in one piece.
         """
+        yield orjson.dumps(self.complete_json(messages, schema, system=system)).decode()
 
-    def complete_with_tools(self, messages: List[dict], tools: List[dict]) -> LLMResponse:
+    def complete_stream(
+        self, messages: List[Message], system: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Streaming variant of complete(): yield the reply text as it arrives.
+
+        The default implementation does not stream: it yields the result of
+        complete() in one piece. Providers with a streaming API should
+        override it.
+        """
+        yield self.complete(messages, system=system)
+
+    def complete_with_tools(
+        self,
+        messages: List[dict],
+        tools: Optional[List[dict]] = None,
+        system: Optional[str] = None,
+    ) -> LLMResponse:
         """
         Send messages with tool definitions and return a structured response.
 
@@ -82,6 +239,9 @@ class BaseLLMClient(ABC):
         represented as a plain string.
 
         *tools* is a list of tool schemas in the provider's native format.
+        When omitted, the tools passed to bind_tools() are used.
+
+        *system* overrides `config.system_prompt` for this call only.
 
         Returns an LLMResponse with the assistant's text, any tool calls
         requested, and the raw content block for re-insertion into the history.
@@ -93,5 +253,117 @@ class BaseLLMClient(ABC):
             "Override complete_with_tools() to add support."
         )
 
+    def complete_with_tools_stream(
+        self,
+        messages: List[dict],
+        tools: Optional[List[dict]] = None,
+        system: Optional[str] = None,
+    ) -> Iterator[StreamEvent]:
+        """
+        Streaming variant of complete_with_tools().
+
+        Yields "text_delta" events as the assistant's text arrives, followed by
+        exactly one "message_stop" event carrying the complete LLMResponse
+        (tool calls included).
+
+        The default implementation does not stream: it calls
+        complete_with_tools() and replays the result as one text delta.
+        Providers with a streaming API should override it.
+        """
+        response = self.complete_with_tools(messages, tools, system=system)
+        if response.text:
+            yield StreamEvent(type="text_delta", text=response.text)
+        yield StreamEvent(type="message_stop", response=response)
+
+    def bind_tools(self, tools: List[dict]) -> None:
+        """
+        Register *tools* as the default for complete_with_tools() calls that
+        don't pass their own. Providers may prepare them once here (e.g. mark
+        them for prompt caching) instead of on every call.
+        """
+        self._bound_tools = tools
+
+    def _resolve_tools(self, tools: Optional[List[dict]]) -> List[dict]:
+        if tools is not None:
+            return tools
+        if self._bound_tools is None:
+            raise ValueError("No tools given and none bound with bind_tools().")
+        return self._bound_tools
+
+    def cached(self, compute: Callable[[], ResponseT], *key_parts: Any) -> ResponseT:
+        """
+        Return a cached response for *key_parts*, or call *compute* and cache it.
+
+        Subclasses wrap their request in this so that repeated identical calls
+        (same model settings, system prompt, messages and schema) skip the
+        provider entirely. Tools key a call on their own normalised input by
+        passing `cache_key` to complete_model() rather than wrapping it, which
+        would store every response twice. Only
+        deterministic calls are cached unless `config.cache_nondeterministic`
+        is set.
+        """
+        key = self._response_cache_key(key_parts)
+        if key is None:
+            return compute()
+        hit, value = self._response_cache_get(key)
+        if not hit:
+            value = compute()
+            self._response_cache_put(key, value)
+        return value
+
+    async def acached(
+        self, compute: Callable[[], Awaitable[ResponseT]], *key_parts: Any
+    ) -> ResponseT:
+        """Async variant of cached(); *compute* returns an awaitable."""
+        key = self._response_cache_key(key_parts)
+        if key is None:
+            return await compute()
+        hit, value = self._response_cache_get(key)
+        if not hit:
+            value = await compute()
+            self._response_cache_put(key, value)
+        return value
+
+    @property
+    def caches_responses(self) -> bool:
+        """
+        Whether the config allows responses to be reused: the cache is not
+        disabled, and the temperature is 0 or `cache_nondeterministic` is set.
+        Callers that keep their own result caches should follow it too.
+        """
+        config = self.config
+        return config.response_cache_size > 0 and (
+            config.temperature == 0 or config.cache_nondeterministic
+        )
+
+    def _response_cache_key(self, key_parts: Tuple[Any, ...]) -> Optional[str]:
+        """Hash *key_parts* with the model settings, or None if caching is off."""
+        if not self.caches_responses:
+            return None
+        config = self.config
+        return hashlib.blake2b(
+            orjson.dumps(
+                [config.model, config.temperature, config.max_tokens,
+                 config.system_prompt, *key_parts]
+            ),
+            digest_size=16,
+        ).hexdigest()
+
+    def _response_cache_get(self, key: str) -> Tuple[bool, Any]:
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return False, None
+            self._response_cache.move_to_end(key)
+            return True, copy.deepcopy(entry[1])
+
+    def _response_cache_put(self, key: str, value: Any) -> None:
+        expires = time.monotonic() + self.config.response_cache_ttl
+        with self._response_cache_lock:
+            self._response_cache[key] = (expires, copy.deepcopy(value))
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > self.config.response_cache_size:
+                self._response_cache.popitem(last=False)
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(model={self.config.model})"
@@ -0,0 +1,105 @@
+import unittest
+from typing import List
+from unittest import mock
+
+import anthropic
+import httpx
+
+from llm_clients import AnthropicClient
+from llm_clients.base_client import LLMConfig, Message
+
+_REPLY = {
+    "id": "msg_1",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-test",
+    "content": [{"type": "text", "text": '{"ok": true}'}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+_ERROR = {"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}}
+
+
+def _client(responses: List[httpx.Response], **config) -> AnthropicClient:
+    """A client whose requests get *responses* in order (the last one repeats)."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return responses[min(len(calls), len(responses)) - 1]
+
+    client = AnthropicClient(
+        LLMConfig(model="claude-test", temperature=0.5, **config),
+        api_key="test",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    client.calls = calls
+    return client
+
+
+def _complete(client: AnthropicClient) -> dict:
+    return client.complete_json([Message(role="user", content="hi")], {"type": "object"})
+
+
+class RetryTest(unittest.TestCase):
+    def test_retry_after_header_sets_the_delay(self) -> None:
+        client = _client(
+            [
+                httpx.Response(429, json=_ERROR, headers={"retry-after": "7"}),
+                httpx.Response(200, json=_REPLY),
+            ]
+        )
+        with mock.patch("time.sleep") as sleep:
+            self.assertEqual(_complete(client), {"ok": True})
+        sleep.assert_called_once_with(7.0)
+        self.assertEqual(len(client.calls), 2)
+
+    def test_retry_after_ms_wins_and_long_delays_are_capped(self) -> None:
+        headers = {"retry-after-ms": "250", "retry-after": "7"}
+        client = _client(
+            [httpx.Response(529, json=_ERROR, headers=headers), httpx.Response(200, json=_REPLY)]
+        )
+        with mock.patch("time.sleep") as sleep:
+            _complete(client)
+        sleep.assert_called_once_with(0.25)
+
+        client = _client(
+            [
+                httpx.Response(429, json=_ERROR, headers={"retry-after": "3600"}),
+                httpx.Response(200, json=_REPLY),
+            ]
+        )
+        with mock.patch("time.sleep") as sleep:
+            _complete(client)
+        sleep.assert_called_once_with(60.0)
+
+    def test_retry_after_past_the_deadline_gives_up(self) -> None:
+        client = _client(
+            [httpx.Response(429, json=_ERROR, headers={"retry-after": "30"})],
+            request_timeout=10.0,
+        )
+        with mock.patch("time.sleep") as sleep, self.assertRaises(anthropic.RateLimitError):
+            _complete(client)
+        sleep.assert_not_called()
+
+    def test_x_should_retry_overrides_the_status(self) -> None:
+        client = _client([httpx.Response(503, json=_ERROR, headers={"x-should-retry": "false"})])
+        with mock.patch("time.sleep") as sleep, self.assertRaises(anthropic.APIStatusError):
+            _complete(client)
+        sleep.assert_not_called()
+        self.assertEqual(len(client.calls), 1)
+
+        client = _client(
+            [
+                httpx.Response(400, json=_ERROR, headers={"x-should-retry": "true"}),
+                httpx.Response(200, json=_REPLY),
+            ]
+        )
+        with mock.patch("time.sleep"):
+            self.assertEqual(_complete(client), {"ok": True})
+        self.assertEqual(len(client.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
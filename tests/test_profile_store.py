@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from agents.gym_trainer.profile_store import SQLiteProfileStore
+from agents.gym_trainer.user_profile import UserProfile, save_profile
+
+
+def _profile(user_id: str, age: int = 30) -> UserProfile:
+    return UserProfile(
+        user_id=user_id,
+        name=user_id.title(),
+        age=age,
+        fitness_level="beginner",
+        goals=["build muscle"],
+        equipment=["dumbbells"],
+        injuries=[],
+        sessions_per_week=3,
+    )
+
+
+class SQLiteProfileStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self._tmp.name
+        self.store = SQLiteProfileStore(os.path.join(self.data_dir, "db", "profiles.db"))
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_save_and_load(self) -> None:
+        self.store.save(_profile("alex"))
+        self.assertEqual(self.store.load("alex").name, "Alex")
+
+    def test_save_replaces(self) -> None:
+        self.store.save(_profile("alex", age=30))
+        self.store.save(_profile("alex", age=31))
+        self.assertEqual(self.store.load("alex").age, 31)
+
+    def test_load_missing_raises_key_error(self) -> None:
+        with self.assertRaises(KeyError):
+            self.store.load("nobody")
+
+    def test_load_many_skips_missing(self) -> None:
+        for user_id in ("alex", "sam"):
+            self.store.save(_profile(user_id))
+        profiles = self.store.load_many(["alex", "sam", "nobody", "alex"])
+        self.assertEqual(sorted(profiles), ["alex", "sam"])
+
+    def test_import_json_dir(self) -> None:
+        for user_id in ("alex", "sam"):
+            save_profile(_profile(user_id), self.data_dir)
+        self.assertEqual(self.store.import_json_dir(self.data_dir), 2)
+        self.assertEqual(self.store.load("sam").name, "Sam")
+
+    def test_import_json_dir_without_profiles(self) -> None:
+        self.assertEqual(self.store.import_json_dir(os.path.join(self.data_dir, "empty")), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
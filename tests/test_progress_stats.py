@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import orjson
+
+from agents.gym_trainer.user_profile import (
+    ProgressStats,
+    WorkoutSession,
+    _rebuild_stats,
+    load_sessions,
+    save_session,
+)
+
+
+def _session(day: str) -> WorkoutSession:
+    return WorkoutSession(
+        date=day,
+        focus_area="full_body",
+        duration_minutes=45,
+        exercises_completed=[],
+        energy_level=3,
+        difficulty_rating=3,
+    )
+
+
+class ProgressStatsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self._tmp.name
+        self.path = os.path.join(self.data_dir, "progress", "alex_progress.jsonl")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def save(self, day: str) -> ProgressStats:
+        stats = save_session("alex", _session(day), self.data_dir)
+        # The incrementally updated totals must match a full recount.
+        rebuilt = _rebuild_stats(self.path)
+        self.assertEqual(
+            (stats.total_sessions, stats.last_date, stats.run_days),
+            (rebuilt.total_sessions, rebuilt.last_date, rebuilt.run_days),
+        )
+        return stats
+
+    def test_first_session(self) -> None:
+        stats = self.save("2026-10-01")
+        self.assertEqual((stats.total_sessions, stats.last_date, stats.run_days), (1, "2026-10-01", 1))
+
+    def test_same_day_counts_once_for_the_streak(self) -> None:
+        self.save("2026-10-01")
+        stats = self.save("2026-10-01")
+        self.assertEqual((stats.total_sessions, stats.run_days), (2, 1))
+
+    def test_consecutive_days_extend_the_streak(self) -> None:
+        for day in ("2026-10-01", "2026-10-02", "2026-10-03"):
+            stats = self.save(day)
+        self.assertEqual((stats.total_sessions, stats.run_days), (3, 3))
+
+    def test_gap_resets_the_streak(self) -> None:
+        for day in ("2026-10-01", "2026-10-02", "2026-10-04"):
+            stats = self.save(day)
+        self.assertEqual((stats.total_sessions, stats.last_date, stats.run_days), (3, "2026-10-04", 1))
+
+    def test_month_boundary_is_consecutive(self) -> None:
+        self.save("2026-09-30")
+        stats = self.save("2026-10-01")
+        self.assertEqual(stats.run_days, 2)
+
+    def test_back_dated_session_fills_a_gap(self) -> None:
+        self.save("2026-10-01")
+        self.save("2026-10-03")
+        stats = self.save("2026-10-02")
+        self.assertEqual((stats.total_sessions, stats.last_date, stats.run_days), (3, "2026-10-03", 3))
+
+    def test_stale_sidecar_is_rebuilt(self) -> None:
+        self.save("2026-10-01")
+        # Edit the history by hand: the sidecar no longer matches its size.
+        with open(self.path, "ab") as f:
+            f.write(orjson.dumps(_session("2026-10-02").model_dump()) + b"\n")
+        stats = self.save("2026-10-03")
+        self.assertEqual((stats.total_sessions, stats.run_days), (3, 3))
+
+    def test_corrupt_sidecar_is_rebuilt(self) -> None:
+        self.save("2026-10-01")
+        with open(self.path[: -len(".jsonl")] + ".meta.json", "wb") as f:
+            f.write(b"{not json")
+        stats = self.save("2026-10-02")
+        self.assertEqual((stats.total_sessions, stats.run_days), (2, 2))
+
+    def test_torn_last_line_is_skipped(self) -> None:
+        self.save("2026-10-01")
+        with open(self.path, "ab") as f:
+            f.write(b'{"date": "2026-10-0')
+        self.assertEqual(len(load_sessions("alex", self.data_dir)), 1)
+        stats = self.save("2026-10-02")
+        self.assertEqual((stats.total_sessions, stats.run_days), (2, 2))
+        self.assertEqual(len(load_sessions("alex", self.data_dir)), 2)
+
+    def test_streak_days_only_counts_up_to_today(self) -> None:
+        today = datetime.now(timezone.utc).date()
+        stats = ProgressStats(total_sessions=2, last_date=today.isoformat(), run_days=2)
+        self.assertEqual(stats.streak_days(), 2)
+        stats.last_date = (today - timedelta(days=2)).isoformat()
+        self.assertEqual(stats.streak_days(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from typing import List, Optional
+
+import orjson
+
+from agents.gym_trainer.gym_trainer_agent import GymTrainerAgent
+from llm_clients.base_client import BaseLLMClient, LLMConfig, Message, ToolCall
+
+_SUMMARY = {"progress_summary": "Solid week.", "achievements": ["First session"]}
+_FEEDBACK = {
+    "intensity_adjustment": "increase",
+    "adjusted_recommendations": ["Add a set"],
+    "motivation_message": "Keep going!",
+    "next_workout_suggestions": ["Heavier squats"],
+}
+
+_SESSION = {
+    "user_id": "alex",
+    "focus_area": "lower_body",
+    "duration_minutes": 40,
+    "exercises_completed": [{"name": "squat", "sets_done": 3, "reps_done": "8"}],
+    "energy_level": 4,
+    "difficulty_rating": 2,
+}
+
+
+class _RecordingClient(BaseLLMClient):
+    """Answers JSON requests from the schema's fields and records each request."""
+
+    def __init__(self) -> None:
+        super().__init__(LLMConfig(model="stub"))
+        self.requests: List[dict] = []
+
+    def complete(self, messages: List[Message], system: Optional[str] = None) -> str:
+        raise AssertionError("unexpected plain-text request")
+
+    def complete_json(self, messages, schema, *, system=None, on_token=None) -> dict:
+        self.requests.append({"message": messages[0].content, "schema": schema})
+        reply = {}
+        if "progress_summary" in schema["properties"]:
+            reply.update(_SUMMARY)
+        if "intensity_adjustment" in schema["properties"]:
+            reply.update(_FEEDBACK)
+        return reply
+
+
+class ProgressWithFeedbackTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.client = _RecordingClient()
+        self.agent = GymTrainerAgent(self.client, data_dir=self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _execute(self, *tool_calls: ToolCall) -> List[dict]:
+        return [orjson.loads(r) for r in self.agent._execute_tools(list(tool_calls))]
+
+    def test_progress_and_feedback_share_one_request(self) -> None:
+        progress, feedback = self._execute(
+            ToolCall("1", "ProgressTrackerTool", _SESSION),
+            ToolCall("2", "FeedbackAdapterTool", {"user_id": "alex", "user_feedback": "too easy"}),
+        )
+        self.assertEqual(len(self.client.requests), 1)
+        self.assertIn("too easy", self.client.requests[0]["message"])
+        self.assertEqual(progress, {"total_sessions": 1, "streak_days": 1, **_SUMMARY})
+        self.assertEqual(feedback, _FEEDBACK)
+        self.assertEqual(self.agent._memory["last_intensity_adjustment"], "increase")
+
+    def test_no_signal_feedback_skips_the_llm(self) -> None:
+        progress, feedback = self._execute(
+            ToolCall("1", "ProgressTrackerTool", _SESSION),
+            ToolCall("2", "FeedbackAdapterTool", {"user_id": "alex", "user_feedback": "OK!"}),
+        )
+        self.assertEqual(len(self.client.requests), 1)
+        self.assertNotIn("intensity_adjustment", self.client.requests[0]["schema"]["properties"])
+        self.assertEqual(progress["progress_summary"], _SUMMARY["progress_summary"])
+        self.assertEqual(feedback["intensity_adjustment"], "maintain")
+
+    def test_different_users_are_not_fused(self) -> None:
+        self._execute(
+            ToolCall("1", "ProgressTrackerTool", _SESSION),
+            ToolCall("2", "FeedbackAdapterTool", {"user_id": "sam", "user_feedback": "too easy"}),
+        )
+        self.assertEqual(len(self.client.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import tempfile
+import unittest
+
+from tools.user_profile_tool import UserProfileTool, UserProfileToolInput
+
+
+class UserProfileToolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tool = UserProfileTool(self._tmp.name)
+        self.tool.run(
+            UserProfileToolInput(
+                action="save",
+                user_id="alex",
+                name="Alex",
+                age=30,
+                fitness_level="beginner",
+                goals=["build muscle"],
+                equipment=["dumbbells"],
+                injuries=[],
+                sessions_per_week=3,
+            )
+        )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _load(self) -> dict:
+        return self.tool.run(UserProfileToolInput(action="load", user_id="alex")).profile
+
+    def test_changing_a_loaded_profile_does_not_change_the_next_load(self) -> None:
+        for _ in range(2):  # the first load fills the cache, the second reads it
+            profile = self._load()
+            profile["goals"].append("run a marathon")
+            profile["injuries"].append("knee")
+            profile["name"] = "Changed"
+
+        profile = self._load()
+        self.assertEqual(profile["goals"], ["build muscle"])
+        self.assertEqual(profile["injuries"], [])
+        self.assertEqual(profile["name"], "Alex")
+
+
+if __name__ == "__main__":
+    unittest.main()
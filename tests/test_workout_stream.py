@@ -0,0 +1,143 @@
+import json
+import unittest
+from typing import Iterator, List, Optional
+
+from llm_clients.base_client import BaseLLMClient, LLMConfig, Message
+from tools.workout_generator_tool import (
+    WorkoutGeneratorInput,
+    WorkoutGeneratorOutput,
+    WorkoutGeneratorTool,
+    _PlanScanner,
+)
+
+PLAN = {
+    "workout_name": 'Push "day" \\ one',
+    "warmup": [
+        {"exercise": "Arm circles, {big}", "duration_seconds": 60, "instructions": "Slow.\nThen fast."}
+    ],
+    "exercises": [
+        {"exercise": "Push-ups [knees]", "sets": 3, "reps": "8-12", "rest_seconds": 60,
+         "instructions": "Keep a \"straight\" line, café-style \u2014 ok"},
+        {"exercise": "Rows", "sets": 3, "reps": "10", "rest_seconds": 90, "instructions": "\\o/"},
+    ],
+    "cooldown": [],
+    "coach_notes": "Hydrate, rest, repeat.",
+}
+
+
+def _scan(text: str, chunk_size: int) -> List[tuple]:
+    scanner = _PlanScanner()
+    completed = []
+    for start in range(0, len(text), chunk_size):
+        completed.extend(scanner.feed(text[start : start + chunk_size]))
+    return completed
+
+
+def _assemble(completed: List[tuple]) -> dict:
+    plan: dict = {}
+    for field, value in completed:
+        if field in ("warmup", "exercises", "cooldown"):
+            plan.setdefault(field, [])
+            if not isinstance(value, list):
+                plan[field].append(value)
+        else:
+            plan[field] = value
+    return plan
+
+
+class PlanScannerTest(unittest.TestCase):
+    def assert_scans(self, text: str) -> None:
+        # Every chunk size, so every boundary falls inside strings, escapes
+        # and between structural characters at least once.
+        for chunk_size in range(1, len(text) + 1):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(_assemble(_scan(text, chunk_size)), PLAN)
+
+    def test_compact_json(self) -> None:
+        self.assert_scans(json.dumps(PLAN, separators=(",", ":")))
+
+    def test_indented_json_with_unicode_escapes(self) -> None:
+        self.assert_scans(json.dumps(PLAN, indent=2, ensure_ascii=True))
+
+    def test_markdown_fence(self) -> None:
+        self.assert_scans("```json\n" + json.dumps(PLAN, ensure_ascii=False) + "\n```")
+
+    def test_empty_array_is_reported(self) -> None:
+        completed = _scan(json.dumps(PLAN), 7)
+        self.assertIn(("cooldown", []), completed)
+
+    def test_fields_complete_in_order(self) -> None:
+        fields = [field for field, _ in _scan(json.dumps(PLAN), 1)]
+        self.assertEqual(fields[0], "workout_name")
+        self.assertEqual(fields[-1], "coach_notes")
+        self.assertLess(fields.index("warmup"), fields.index("exercises"))
+
+    def test_items_are_reported_as_they_close(self) -> None:
+        text = json.dumps(PLAN)
+        cut = text.index('"Rows"')
+        scanner = _PlanScanner()
+        first = scanner.feed(text[:cut])
+        self.assertEqual([v["exercise"] for f, v in first if f == "exercises" and v], ["Push-ups [knees]"])
+
+
+class _StreamingClient(BaseLLMClient):
+    """Streams a fixed JSON reply in small pieces."""
+
+    def __init__(self, reply: str, chunk_size: int) -> None:
+        super().__init__(LLMConfig(model="stub"))
+        self._reply = reply
+        self._chunk_size = chunk_size
+
+    def complete(self, messages: List[Message], system: Optional[str] = None) -> str:
+        return self._reply
+
+    def complete_json(self, messages, schema, *, system=None, on_token=None) -> dict:
+        return json.loads(self._reply)
+
+    def complete_json_stream(self, messages, schema, *, system=None) -> Iterator[str]:
+        for start in range(0, len(self._reply), self._chunk_size):
+            yield self._reply[start : start + self._chunk_size]
+
+
+class WorkoutStreamTest(unittest.TestCase):
+    def test_last_partial_is_the_validated_plan(self) -> None:
+        tool = WorkoutGeneratorTool(_StreamingClient(json.dumps(PLAN), chunk_size=5))
+        tool_input = WorkoutGeneratorInput(
+            fitness_level="beginner",
+            goals=["build muscle"],
+            equipment=["bodyweight only"],
+            injuries=[],
+            focus_area="upper_body",
+        )
+        partials = list(tool.stream(tool_input))
+        self.assertGreater(len(partials), 1)
+        expected = WorkoutGeneratorOutput.model_validate(PLAN)
+        self.assertEqual(WorkoutGeneratorOutput.model_validate(partials[-1]), expected)
+        self.assertEqual(partials[0], {"workout_name": PLAN["workout_name"]})
+
+    def test_yielded_partials_do_not_change_later(self) -> None:
+        tool = WorkoutGeneratorTool(_StreamingClient(json.dumps(PLAN), chunk_size=3))
+        tool_input = WorkoutGeneratorInput(
+            fitness_level="beginner",
+            goals=["build muscle"],
+            equipment=["bodyweight only"],
+            injuries=[],
+            focus_area="upper_body",
+        )
+        snapshots = []
+        partials = []
+        for partial in tool.stream(tool_input):
+            partials.append(partial)
+            snapshots.append({k: len(v) for k, v in partial.items() if isinstance(v, list)})
+        # Each partial still has the counts it had when it was yielded...
+        for partial, counts in zip(partials, snapshots):
+            self.assertEqual({k: len(v) for k, v in partial.items() if isinstance(v, list)}, counts)
+        # ...and the counts never go down from one partial to the next.
+        for earlier, later in zip(snapshots, snapshots[1:]):
+            for field, count in earlier.items():
+                self.assertGreaterEqual(later[field], count)
+        self.assertIn(0, [counts.get("exercises") for counts in snapshots])
+
+
+if __name__ == "__main__":
+    unittest.main()
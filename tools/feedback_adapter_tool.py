@@ -5,12 +5,13 @@ Loads the user's last 5 sessions from disk and uses the LLM to recommend
 intensity adjustments and personalised next-session suggestions.
 """
 
-import json
-from typing import List, Literal
+import re
+from typing import List, Literal, Optional
 
+import orjson
 from pydantic import Field
 
-from agents.gym_trainer.user_profile import load_sessions
+from agents.gym_trainer.user_profile import load_recent_sessions
 from llm_clients.base_client import BaseLLMClient, Message
 from tools.base_tool import BaseTool, ToolInput, ToolOutput
 
@@ -20,6 +21,21 @@ feedback. Determine whether the training intensity should increase, decrease, or
 stay the same. Provide specific, actionable recommendations for the next sessions
 and an encouraging message to keep the client motivated."""
 
+_NON_WORD = re.compile(r"[^\w]+")
+
+# Normalised feedback that says nothing about how the workouts felt. These get
+# a "maintain" answer without an LLM call.
+_NO_SIGNAL_FEEDBACK = frozenset(
+    {"", "ok", "okay", "k", "fine", "good", "thanks", "thank you", "none", "n a", "na"}
+)
+# Longer feedback is cut before it goes into the prompt.
+MAX_FEEDBACK_CHARS = 2_000
+
+
+def _normalize_feedback(text: str) -> str:
+    """Lower-case *text* and collapse punctuation and spacing to single spaces."""
+    return " ".join(_NON_WORD.sub(" ", text.casefold()).split())
+
 
 class FeedbackAdapterInput(ToolInput):
     user_id: str = Field(description="The user's unique identifier.")
@@ -44,6 +60,25 @@ class FeedbackAdapterOutput(ToolOutput):
     )
 
 
+def no_signal_reply(user_feedback: str) -> Optional[FeedbackAdapterOutput]:
+    """
+    The fixed "maintain" reply for feedback that says nothing about how the
+    workouts felt ("ok", "Thanks!"), or None if *user_feedback* needs the LLM.
+    """
+    if _normalize_feedback(user_feedback) not in _NO_SIGNAL_FEEDBACK:
+        return None
+    return FeedbackAdapterOutput(
+        intensity_adjustment="maintain",
+        adjusted_recommendations=[],
+        motivation_message="Thanks for checking in — keep up the consistent work!",
+        next_workout_suggestions=[],
+    )
+
+
+# The output model never changes, so generate its JSON schema once.
+_OUTPUT_SCHEMA = FeedbackAdapterOutput.model_json_schema()
+
+
 class FeedbackAdapterTool(BaseTool[FeedbackAdapterInput, FeedbackAdapterOutput]):
     """Analyse recent workout history and user feedback to adapt the training plan."""
 
@@ -61,28 +96,36 @@ class FeedbackAdapterTool(BaseTool[FeedbackAdapterInput, FeedbackAdapterOutput])
         self._data_dir = data_dir
 
     def run(self, tool_input: FeedbackAdapterInput) -> FeedbackAdapterOutput:
-        recent_sessions = load_sessions(tool_input.user_id, self._data_dir)[-5:]
+        reply = no_signal_reply(tool_input.user_feedback)
+        if reply is not None:
+            return reply
 
+        feedback = _normalize_feedback(tool_input.user_feedback)
+        recent_sessions = load_recent_sessions(tool_input.user_id, self._data_dir, 5)
+
+        # Compact JSON without empty fields: indentation and nulls are tokens
+        # the model has to read but gains nothing from.
         history_str = (
-            json.dumps(recent_sessions, indent=2)
+            orjson.dumps(
+                [{k: v for k, v in s.items() if v is not None} for s in recent_sessions]
+            ).decode()
             if recent_sessions
             else "No sessions logged yet."
         )
 
         user_message = (
-            f"User feedback: {tool_input.user_feedback}\n\n"
+            f"User feedback: {tool_input.user_feedback[:MAX_FEEDBACK_CHARS]}\n\n"
             f"Recent workout history (last {len(recent_sessions)} sessions):\n{history_str}"
         )
 
-        schema = FeedbackAdapterOutput.model_json_schema()
-
-        original_system = self._llm.config.system_prompt
-        self._llm.config.system_prompt = _SYSTEM_PROMPT
-        try:
-            raw = self._llm.complete_json(
-                [Message(role="user", content=user_message)], schema
-            )
-        finally:
-            self._llm.config.system_prompt = original_system
-
-        return FeedbackAdapterOutput(**raw)
\ No newline at end of file
+        # Users tend to repeat the same short feedback ("too easy", "Too easy!")
+        # between sessions; with unchanged history the answer would be the same.
+        # So the client's response cache (used when its config allows) is keyed
+        # on the normalised feedback rather than the exact message.
+        return self._llm.complete_model(
+            [Message(role="user", content=user_message)],
+            FeedbackAdapterOutput,
+            schema=_OUTPUT_SCHEMA,
+            system=_SYSTEM_PROMPT,
+            cache_key=("FeedbackAdapterTool", feedback, history_str),
+        )
\ No newline at end of file
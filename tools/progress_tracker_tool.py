@@ -5,15 +5,20 @@ File I/O (pure Python) handles persistence; the LLM generates a human-readable
 progress summary and identifies achievements.
 """
 
-import json
-from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+import orjson
 from pydantic import Field
 
-from agents.gym_trainer.user_profile import WorkoutSession, load_sessions, save_session
+from agents.gym_trainer.user_profile import WorkoutSession, load_recent_sessions, save_session
 from llm_clients.base_client import BaseLLMClient, Message
 from tools.base_tool import BaseTool, ToolInput, ToolOutput
+from tools.feedback_adapter_tool import (
+    MAX_FEEDBACK_CHARS,
+    FeedbackAdapterInput,
+    FeedbackAdapterOutput,
+    no_signal_reply,
+)
 
 _SYSTEM_PROMPT = """\
 You are an encouraging personal trainer reviewing a client's workout history.
@@ -21,6 +26,26 @@ Summarise their recent progress in 2-3 motivating sentences and identify any
 noteworthy achievements (e.g. consistency streak, improving difficulty tolerance,
 reaching session milestones). Be specific and positive."""
 
+# The part of ProgressTrackerOutput the LLM fills in; the counts are computed locally.
+_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "progress_summary": {"type": "string"},
+        "achievements": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["progress_summary", "achievements"],
+}
+
+
+# run_with_feedback() asks for the progress summary and the feedback analysis
+# in one call, so its prompt covers both tools' jobs.
+_COMBINED_SYSTEM_PROMPT = _SYSTEM_PROMPT + """
+
+The client has also told you how their recent workouts felt. Decide whether the
+training intensity should increase, decrease, or stay the same, and give specific,
+actionable recommendations, concrete suggestions for the next 1-2 sessions, and
+an encouraging message."""
+
 
 class ProgressTrackerInput(ToolInput):
     user_id: str = Field(description="The user's unique identifier.")
@@ -46,24 +71,14 @@ class ProgressTrackerOutput(ToolOutput):
     achievements: List[str]
 
 
-def _compute_streak(sessions: List[dict]) -> int:
-    """Return the current consecutive-day streak (today counts if there's a session)."""
-    if not sessions:
-        return 0
-    dates = sorted(
-        {datetime.fromisoformat(s["date"]).date() for s in sessions},
-        reverse=True,
-    )
-    today = datetime.utcnow().date()
-    streak = 0
-    expected = today
-    for d in dates:
-        if d == expected:
-            streak += 1
-            expected -= timedelta(days=1)
-        elif d < expected:
-            break
-    return streak
+class _SummaryWithFeedback(FeedbackAdapterOutput):
+    """What the LLM returns for run_with_feedback()."""
+
+    progress_summary: str
+    achievements: List[str]
+
+
+_COMBINED_SCHEMA = _SummaryWithFeedback.model_json_schema()
 
 
 class ProgressTrackerTool(BaseTool[ProgressTrackerInput, ProgressTrackerOutput]):
@@ -83,53 +98,87 @@ class ProgressTrackerTool(BaseTool[ProgressTrackerInput, ProgressTrackerOutput])
         self._data_dir = data_dir
 
     def run(self, tool_input: ProgressTrackerInput) -> ProgressTrackerOutput:
-        # Persist the new session.
-        session = WorkoutSession(
-            focus_area=tool_input.focus_area,
-            duration_minutes=tool_input.duration_minutes,
-            exercises_completed=tool_input.exercises_completed,
-            energy_level=tool_input.energy_level,
-            difficulty_rating=tool_input.difficulty_rating,
-            notes=tool_input.notes,
-        )
-        save_session(tool_input.user_id, session, self._data_dir)
-
-        # Reload full history for analysis.
-        all_sessions = load_sessions(tool_input.user_id, self._data_dir)
-        total = len(all_sessions)
-        streak = _compute_streak(all_sessions)
+        total, streak, history = self._log_session(tool_input)
 
         # Ask the LLM for a human-readable summary and achievements.
-        recent = all_sessions[-5:]
-        history_str = json.dumps(recent, indent=2)
         user_message = (
-            f"The user just completed session #{total}.\n"
-            f"Streak: {streak} consecutive day(s).\n\n"
-            f"Recent sessions (last {len(recent)}):\n{history_str}\n\n"
+            f"{history}\n\n"
             "Write a short motivating progress summary and list specific achievements."
         )
-
-        schema = {
-            "type": "object",
-            "properties": {
-                "progress_summary": {"type": "string"},
-                "achievements": {"type": "array", "items": {"type": "string"}},
-            },
-            "required": ["progress_summary", "achievements"],
-        }
-
-        original_system = self._llm.config.system_prompt
-        self._llm.config.system_prompt = _SYSTEM_PROMPT
-        try:
-            raw = self._llm.complete_json(
-                [Message(role="user", content=user_message)], schema
-            )
-        finally:
-            self._llm.config.system_prompt = original_system
+        raw = self._llm.complete_json(
+            [Message(role="user", content=user_message)], _SUMMARY_SCHEMA, system=_SYSTEM_PROMPT
+        )
 
         return ProgressTrackerOutput(
             total_sessions=total,
             streak_days=streak,
             progress_summary=raw["progress_summary"],
             achievements=raw["achievements"],
-        )
\ No newline at end of file
+        )
+
+    def run_with_feedback(
+        self, tool_input: ProgressTrackerInput, feedback_input: FeedbackAdapterInput
+    ) -> Tuple[ProgressTrackerOutput, FeedbackAdapterOutput]:
+        """
+        Log a session and analyse the user's feedback in a single LLM call.
+
+        Returns what run() followed by FeedbackAdapterTool.run() would, but
+        the summary and the intensity recommendation share one request.
+        Feedback with nothing to act on ("ok") still gets FeedbackAdapterTool's
+        fixed reply, and only the summary goes to the LLM.
+        """
+        reply = no_signal_reply(feedback_input.user_feedback)
+        if reply is not None:
+            return self.run(tool_input), reply
+
+        total, streak, history = self._log_session(tool_input)
+        user_message = (
+            f"{history}\n\n"
+            f"User feedback: {feedback_input.user_feedback[:MAX_FEEDBACK_CHARS]}\n\n"
+            "Write a short motivating progress summary, list specific achievements, "
+            "and adapt the training plan to the feedback."
+        )
+        result = self._llm.complete_model(
+            [Message(role="user", content=user_message)],
+            _SummaryWithFeedback,
+            schema=_COMBINED_SCHEMA,
+            system=_COMBINED_SYSTEM_PROMPT,
+        )
+
+        progress = ProgressTrackerOutput(
+            total_sessions=total,
+            streak_days=streak,
+            progress_summary=result.progress_summary,
+            achievements=result.achievements,
+        )
+        feedback = FeedbackAdapterOutput(
+            **result.model_dump(exclude={"progress_summary", "achievements"})
+        )
+        return progress, feedback
+
+    def _log_session(self, tool_input: ProgressTrackerInput) -> Tuple[int, int, str]:
+        """Persist the session; return (total, streak, prompt text describing the history)."""
+        session = WorkoutSession(
+            focus_area=tool_input.focus_area,
+            duration_minutes=tool_input.duration_minutes,
+            exercises_completed=tool_input.exercises_completed,
+            energy_level=tool_input.energy_level,
+            difficulty_rating=tool_input.difficulty_rating,
+            notes=tool_input.notes,
+        )
+        # Saving returns the running totals, so the full history isn't reloaded.
+        stats = save_session(tool_input.user_id, session, self._data_dir)
+        total = stats.total_sessions
+        streak = stats.streak_days()
+
+        recent = load_recent_sessions(tool_input.user_id, self._data_dir, 5)
+        # Compact JSON without empty fields keeps the prompt short.
+        history_str = orjson.dumps(
+            [{k: v for k, v in s.items() if v is not None} for s in recent]
+        ).decode()
+        history = (
+            f"The user just completed session #{total}.\n"
+            f"Streak: {streak} consecutive day(s).\n\n"
+            f"Recent sessions (last {len(recent)}):\n{history_str}"
+        )
+        return total, streak, history
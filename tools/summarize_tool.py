@@ -11,7 +11,7 @@ multiple times (once per chunk, then once for the final merge).
 
 from __future__ import annotations
 
-from typing import List
+from typing import Callable, List, Optional
 
 from pydantic import Field
 
@@ -46,6 +46,20 @@ class SummarizeToolOutput(ToolOutput):
     )
 
 
+# Reply schema shared by both tools; built once rather than per call.
+_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "key_takeaways": {
+            "type": "array",
+            "items": {"type": "string"},
+        },
+    },
+    "required": ["summary", "key_takeaways"],
+}
+
+
 # ---------------------------------------------------------------------------
 # Tool
 # ---------------------------------------------------------------------------
@@ -90,40 +104,61 @@ class SummarizeTool(BaseTool[SummarizeToolInput, SummarizeToolOutput]):
     input_type = SummarizeToolInput
     output_type = SummarizeToolOutput
 
-    def __init__(self, llm_client: BaseLLMClient) -> None:
+    def __init__(
+        self,
+        llm_client: BaseLLMClient,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> None:
         self._llm = llm_client
+        # Receives the raw JSON reply as it streams in, e.g. to show progress.
+        self._on_token = on_token
 
     def run(self, tool_input: SummarizeToolInput) -> SummarizeToolOutput:
         system = _CHUNK_PROMPT if tool_input.is_chunk else _FULL_PROMPT
 
-        schema = {
-            "type": "object",
-            "properties": {
-                "summary": {"type": "string"},
-                "key_takeaways": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                },
-            },
-            "required": ["summary", "key_takeaways"],
-        }
-
         messages = [
             Message(role="user", content=tool_input.text),
         ]
 
-        # Temporarily override system prompt for this call.
-        original_system = self._llm.config.system_prompt
-        self._llm.config.system_prompt = system
-
-        result = self._llm.complete_json(messages, schema)
-
-        self._llm.config.system_prompt = original_system
+        # Pass the system prompt per call so concurrent chunk summaries can
+        # share one client without clobbering each other's prompt.
+        return self._llm.complete_model(
+            messages,
+            SummarizeToolOutput,
+            schema=_SUMMARY_SCHEMA,
+            system=system,
+            on_token=self._on_token,
+        )
 
-        return SummarizeToolOutput(
-            summary=result["summary"],
-            key_takeaways=result["key_takeaways"],
+    async def arun(self, tool_input: SummarizeToolInput) -> SummarizeToolOutput:
+        """Async variant of run(), so many chunks can be awaited together."""
+        system = _CHUNK_PROMPT if tool_input.is_chunk else _FULL_PROMPT
+        result = await self._llm.acomplete_json(
+            [Message(role="user", content=tool_input.text)], _SUMMARY_SCHEMA, system=system
         )
+        return SummarizeToolOutput.model_validate(result)
+
+    def run_many(self, tool_inputs: List[SummarizeToolInput]) -> List[SummarizeToolOutput]:
+        """
+        Summarize many independent texts in one provider batch.
+
+        Inputs are grouped by prompt (chunk vs full text) and each group is sent
+        through `complete_json_batch`, which may use a bulk API that is cheaper
+        but slower than individual calls. Outputs are returned in input order.
+        """
+        outputs: List[Optional[SummarizeToolOutput]] = [None] * len(tool_inputs)
+        for is_chunk, system in ((True, _CHUNK_PROMPT), (False, _FULL_PROMPT)):
+            indices = [i for i, t in enumerate(tool_inputs) if t.is_chunk is is_chunk]
+            if not indices:
+                continue
+            results = self._llm.complete_json_batch(
+                [[Message(role="user", content=tool_inputs[i].text)] for i in indices],
+                _SUMMARY_SCHEMA,
+                system=system,
+            )
+            for i, result in zip(indices, results):
+                outputs[i] = SummarizeToolOutput.model_validate(result)
+        return outputs
 
 
 class MergeSummariesTool(BaseTool[SummarizeToolInput, SummarizeToolOutput]):
@@ -138,32 +173,29 @@ class MergeSummariesTool(BaseTool[SummarizeToolInput, SummarizeToolOutput]):
     input_type = SummarizeToolInput
     output_type = SummarizeToolOutput
 
-    def __init__(self, llm_client: BaseLLMClient) -> None:
+    def __init__(
+        self,
+        llm_client: BaseLLMClient,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> None:
         self._llm = llm_client
+        # Receives the raw JSON reply as it streams in, e.g. to show progress.
+        self._on_token = on_token
 
     def run(self, tool_input: SummarizeToolInput) -> SummarizeToolOutput:
-        schema = {
-            "type": "object",
-            "properties": {
-                "summary": {"type": "string"},
-                "key_takeaways": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                },
-            },
-            "required": ["summary", "key_takeaways"],
-        }
-
         messages = [Message(role="user", content=tool_input.text)]
 
-        original_system = self._llm.config.system_prompt
-        self._llm.config.system_prompt = _MERGE_PROMPT
-
-        result = self._llm.complete_json(messages, schema)
-
-        self._llm.config.system_prompt = original_system
+        return self._llm.complete_model(
+            messages,
+            SummarizeToolOutput,
+            schema=_SUMMARY_SCHEMA,
+            system=_MERGE_PROMPT,
+            on_token=self._on_token,
+        )
 
-        return SummarizeToolOutput(
-            summary=result["summary"],
-            key_takeaways=result["key_takeaways"],
+    async def arun(self, tool_input: SummarizeToolInput) -> SummarizeToolOutput:
+        """Async variant of run()."""
+        result = await self._llm.acomplete_json(
+            [Message(role="user", content=tool_input.text)], _SUMMARY_SCHEMA, system=_MERGE_PROMPT
         )
+        return SummarizeToolOutput.model_validate(result)
@@ -5,7 +5,9 @@ No LLM call is made; this tool is pure file I/O so the agent always has
 accurate, persistent data about the user.
 """
 
-from typing import Literal, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Literal, List, Optional, Tuple
 
 from pydantic import Field
 
@@ -17,6 +19,9 @@ from agents.gym_trainer.user_profile import (
 from tools.base_tool import BaseTool, ToolInput, ToolOutput
 
 
+PROFILE_DICT_CACHE_SIZE = 128
+
+
 class UserProfileToolInput(ToolInput):
     action: Literal["save", "load"] = Field(
         description="'save' to create/update the profile, 'load' to retrieve it."
@@ -64,6 +69,10 @@ class UserProfileTool(BaseTool[UserProfileToolInput, UserProfileToolOutput]):
 
     def __init__(self, data_dir: str = "data") -> None:
         self._data_dir = data_dir
+        # user_id -> (profile, its model_dump()). load_profile() returns the same
+        # cached object until the file changes, so the dump can be reused too.
+        self._profile_dicts: "OrderedDict[str, Tuple[UserProfile, dict]]" = OrderedDict()
+        self._profile_dicts_lock = threading.Lock()
 
     def run(self, tool_input: UserProfileToolInput) -> UserProfileToolOutput:
         if tool_input.action == "load":
@@ -72,7 +81,7 @@ class UserProfileTool(BaseTool[UserProfileToolInput, UserProfileToolOutput]):
                 return UserProfileToolOutput(
                     success=True,
                     message=f"Profile loaded for user '{tool_input.user_id}'.",
-                    profile=profile.model_dump(),
+                    profile=self._profile_dict(tool_input.user_id, profile),
                 )
             except FileNotFoundError:
                 return UserProfileToolOutput(
@@ -92,7 +101,9 @@ class UserProfileTool(BaseTool[UserProfileToolInput, UserProfileToolOutput]):
                 message=f"Cannot save profile — missing required fields: {', '.join(missing)}.",
             )
 
-        profile = UserProfile(
+        # Every field was already validated by UserProfileToolInput (same types,
+        # and the None checks above), so skip validating them a second time.
+        profile = UserProfile.model_construct(
             user_id=tool_input.user_id,
             name=tool_input.name,
             age=tool_input.age,
@@ -103,8 +114,39 @@ class UserProfileTool(BaseTool[UserProfileToolInput, UserProfileToolOutput]):
             sessions_per_week=tool_input.sessions_per_week,
         )
         save_profile(profile, self._data_dir)
+        with self._profile_dicts_lock:
+            self._profile_dicts.pop(tool_input.user_id, None)
         return UserProfileToolOutput(
             success=True,
             message=f"Profile saved for user '{tool_input.user_id}'.",
             profile=profile.model_dump(),
-        )
\ No newline at end of file
+        )
+
+    def _profile_dict(self, user_id: str, profile: UserProfile) -> dict:
+        """
+        Return profile.model_dump(), reusing the last one if *profile* is unchanged.
+
+        The caller always gets its own copy, so changing the returned dict or
+        its lists never reaches the cached one.
+        """
+        with self._profile_dicts_lock:
+            entry = self._profile_dicts.get(user_id)
+            if entry is not None and entry[0] is profile:
+                self._profile_dicts.move_to_end(user_id)
+                return _copy_profile_dict(entry[1])
+        data = profile.model_dump()
+        with self._profile_dicts_lock:
+            self._profile_dicts[user_id] = (profile, data)
+            self._profile_dicts.move_to_end(user_id)
+            if len(self._profile_dicts) > PROFILE_DICT_CACHE_SIZE:
+                self._profile_dicts.popitem(last=False)
+        return _copy_profile_dict(data)
+
+
+def _copy_profile_dict(data: dict) -> dict:
+    """
+    Copy a dumped UserProfile. Its values are strings, ints, or lists of
+    strings, so copying the lists gives a full copy at a fraction of the cost
+    of copy.deepcopy() (which is slower than dumping the model again).
+    """
+    return {k: list(v) if isinstance(v, list) else v for k, v in data.items()}
@@ -6,8 +6,11 @@ asks Claude to return a fully structured plan with warmup, main exercises, and
 cooldown.
 """
 
-from typing import List, Literal
+import asyncio
+import re
+from typing import Any, Iterator, List, Literal, Tuple, TypedDict
 
+import orjson
 from pydantic import BaseModel, Field
 
 from llm_clients.base_client import BaseLLMClient, LLMConfig, Message
@@ -61,6 +64,107 @@ class WorkoutGeneratorOutput(ToolOutput):
     coach_notes: str
 
 
+# The output model never changes, so generate its JSON schema once. The nested
+# exercise models make this noticeably slower than the other tools' schemas.
+_WORKOUT_SCHEMA = WorkoutGeneratorOutput.model_json_schema()
+
+
+class PartialWorkout(TypedDict, total=False):
+    """A workout plan as far as it has streamed in; see WorkoutGeneratorTool.stream()."""
+
+    workout_name: str
+    warmup: List[WarmupExercise]
+    exercises: List[MainExercise]
+    cooldown: List[WarmupExercise]
+    coach_notes: str
+
+
+_ITEM_TYPES = {"warmup": WarmupExercise, "exercises": MainExercise, "cooldown": WarmupExercise}
+_STRUCTURAL = re.compile(r'[{}\[\]",]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class _PlanScanner:
+    """
+    Pick completed fields out of a workout plan JSON object as it streams in.
+
+    Each character is scanned once, tracking only string state and nesting
+    depth. A slice is parsed when a top-level string value or an object inside
+    a top-level array (one exercise) closes, and a top-level array opening is
+    reported as an empty list. Text outside the root object, such as a
+    markdown fence, is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key = ""
+        self._item_start = -1
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add *chunk* and return the (field, value) pairs it completed."""
+        self._text += chunk
+        text = self._text
+        n = len(text)
+        completed: List[Tuple[str, Any]] = []
+        i = self._pos
+        while i < n:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    i = n
+                    break
+                i = match.start()
+                if text[i] == "\\":
+                    if i + 1 >= n:
+                        break  # wait for the escaped character
+                    i += 2
+                    continue
+                self._in_string = False
+                if self._depth == 1:
+                    value = orjson.loads(text[self._string_start : i + 1])
+                    if self._expect_key:
+                        self._key = value
+                        self._expect_key = False
+                    else:
+                        completed.append((self._key, value))
+                i += 1
+                continue
+
+            match = _STRUCTURAL.search(text, i)
+            if match is None:
+                i = n
+                break
+            i = match.start()
+            char = text[i]
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ",":
+                if self._depth == 1:
+                    self._expect_key = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+                elif self._depth == 2 and char == "[":
+                    completed.append((self._key, []))  # so empty arrays are reported too
+                elif self._depth == 3 and char == "{":
+                    self._item_start = i
+            else:
+                if self._depth == 3 and self._item_start >= 0:
+                    completed.append((self._key, orjson.loads(text[self._item_start : i + 1])))
+                    self._item_start = -1
+                self._depth -= 1
+            i += 1
+        self._pos = i
+        return completed
+
+
 class WorkoutGeneratorTool(BaseTool[WorkoutGeneratorInput, WorkoutGeneratorOutput]):
     """Generate a personalised workout plan tailored to the user's profile and session preferences."""
 
@@ -76,24 +180,120 @@ class WorkoutGeneratorTool(BaseTool[WorkoutGeneratorInput, WorkoutGeneratorOutpu
         self._llm = llm_client
 
     def run(self, tool_input: WorkoutGeneratorInput) -> WorkoutGeneratorOutput:
-        user_message = (
+        # Nothing constrains the reply to the schema, so it is still validated;
+        # complete_model() lets the client do that straight from the reply text.
+        return self._llm.complete_model(
+            [Message(role="user", content=self._user_message(tool_input))],
+            WorkoutGeneratorOutput,
+            schema=_WORKOUT_SCHEMA,
+            system=_SYSTEM_PROMPT,
+            cache_key=self._cache_key(tool_input),
+        )
+
+    def stream(self, tool_input: WorkoutGeneratorInput) -> Iterator[PartialWorkout]:
+        """
+        Generate a plan, yielding it section by section as the reply streams in.
+
+        A new PartialWorkout is yielded whenever a field or a single exercise
+        is complete, so callers can start showing the warmup before the
+        cooldown has been generated. The last one yielded is the full plan,
+        validated like run()'s output.
+        """
+        chunks = self._llm.complete_json_stream(
+            [Message(role="user", content=self._user_message(tool_input))],
+            _WORKOUT_SCHEMA,
+            system=_SYSTEM_PROMPT,
+        )
+
+        plan: PartialWorkout = {}
+        scanner = _PlanScanner()
+        for chunk in chunks:
+            completed = scanner.feed(chunk)
+            for field, value in completed:
+                item_type = _ITEM_TYPES.get(field)
+                if item_type is None:
+                    plan[field] = value
+                elif isinstance(value, list):
+                    plan.setdefault(field, [])
+                else:
+                    plan.setdefault(field, []).append(item_type.model_validate(value))
+            if completed:
+                # Copy the lists: the scanner keeps appending to them, and a
+                # partial the caller already holds must not change.
+                yield PartialWorkout(
+                    **{k: list(v) if isinstance(v, list) else v for k, v in plan.items()}
+                )
+
+        output = WorkoutGeneratorOutput.model_validate(plan)
+        yield PartialWorkout(**dict(output))
+
+    async def arun(self, tool_input: WorkoutGeneratorInput) -> WorkoutGeneratorOutput:
+        """Async variant of run()."""
+        raw = await self._llm.acomplete_json(
+            [Message(role="user", content=self._user_message(tool_input))],
+            _WORKOUT_SCHEMA,
+            system=_SYSTEM_PROMPT,
+            cache_key=self._cache_key(tool_input),
+        )
+        return WorkoutGeneratorOutput.model_validate(raw)
+
+    async def arun_many(
+        self, tool_inputs: List[WorkoutGeneratorInput], max_concurrency: int = 8
+    ) -> List[WorkoutGeneratorOutput]:
+        """
+        Generate several plans (e.g. a weekly split) concurrently.
+
+        At most *max_concurrency* requests are in flight at once, to stay within
+        provider rate limits. Outputs are returned in input order.
+        """
+        limit = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def generate(tool_input: WorkoutGeneratorInput) -> WorkoutGeneratorOutput:
+            async with limit:
+                return await self.arun(tool_input)
+
+        return list(await asyncio.gather(*(generate(t) for t in tool_inputs)))
+
+    def run_many(self, tool_inputs: List[WorkoutGeneratorInput]) -> List[WorkoutGeneratorOutput]:
+        """
+        Generate several plans in one provider batch.
+
+        Uses `complete_json_batch`, which may go through a bulk API that is
+        cheaper but can take minutes; prefer arun_many() for interactive use.
+        """
+        results = self._llm.complete_json_batch(
+            [[Message(role="user", content=self._user_message(t))] for t in tool_inputs],
+            _WORKOUT_SCHEMA,
+            system=_SYSTEM_PROMPT,
+        )
+        return [WorkoutGeneratorOutput.model_validate(raw) for raw in results]
+
+    @staticmethod
+    def _cache_key(tool_input: WorkoutGeneratorInput) -> tuple:
+        """
+        Response-cache key for *tool_input*, passed to the client as
+        `cache_key`; the client adds the model settings and applies the
+        config's caching policy.
+
+        List order and case don't change the request, so ["Dumbbells", "bench"]
+        and ["bench", "dumbbells"] share an entry.
+        """
+        return (
+            "WorkoutGeneratorTool",
+            tool_input.fitness_level,
+            sorted(g.strip().casefold() for g in tool_input.goals),
+            sorted(e.strip().casefold() for e in tool_input.equipment),
+            sorted(i.strip().casefold() for i in tool_input.injuries),
+            tool_input.focus_area,
+            tool_input.duration_minutes,
+        )
+
+    @staticmethod
+    def _user_message(tool_input: WorkoutGeneratorInput) -> str:
+        return (
             f"Create a {tool_input.duration_minutes}-minute {tool_input.focus_area.replace('_', ' ')} workout.\n"
             f"Fitness level: {tool_input.fitness_level}\n"
             f"Goals: {', '.join(tool_input.goals)}\n"
             f"Equipment: {', '.join(tool_input.equipment)}\n"
             f"Injuries/limitations: {', '.join(tool_input.injuries) if tool_input.injuries else 'none'}"
         )
-
-        schema = WorkoutGeneratorOutput.model_json_schema()
-
-        # Temporarily override the system prompt for this structured call.
-        original_system = self._llm.config.system_prompt
-        self._llm.config.system_prompt = _SYSTEM_PROMPT
-        try:
-            raw = self._llm.complete_json(
-                [Message(role="user", content=user_message)], schema
-            )
-        finally:
-            self._llm.config.system_prompt = original_system
-
-        return WorkoutGeneratorOutput(**raw)
\ No newline at end of file